@@ -0,0 +1,72 @@
+# File: backend/app/audio_peaks.py
+"""
+AI-SUMMARY: Decodes an audio file to mono PCM and reduces it to a fixed number
+of peak values (int8, 0-127). Runs inside waveform worker processes, so it
+imports nothing from the app. 16-bit WAV is read with the standard library;
+everything else is decoded by ffmpeg.
+"""
+
+import shutil
+import subprocess
+import wave
+from pathlib import Path
+from typing import Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUMPY_AVAILABLE = np is not None
+FFMPEG_PATH = shutil.which("ffmpeg")
+
+
+def can_decode(path: Path) -> bool:
+    return NUMPY_AVAILABLE and (FFMPEG_PATH is not None or path.suffix.lower() == ".wav")
+
+
+def _read_wav(path: str) -> Tuple["np.ndarray", int]:
+    with wave.open(path, "rb") as wav:
+        channels = wav.getnchannels()
+        rate = wav.getframerate()
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2")
+    return samples.reshape(-1, channels), rate
+
+
+def _read_ffmpeg(path: str, sample_rate: int, timeout: float) -> Tuple["np.ndarray", int]:
+    proc = subprocess.run(
+        [FFMPEG_PATH, "-v", "error", "-i", path, "-ac", "1", "-ar", str(sample_rate), "-f", "s16le", "-"],
+        capture_output=True,
+        timeout=timeout,
+    )
+    if proc.returncode != 0:
+        raise ValueError(proc.stderr.decode(errors="replace").strip() or "ffmpeg failed")
+    return np.frombuffer(proc.stdout, dtype="<i2").reshape(-1, 1), sample_rate
+
+
+def compute_peaks(path: str, peak_count: int, sample_rate: int, timeout: float) -> Tuple[bytes, int]:
+    """Return (int8 peaks as bytes, duration in ms) for the file at path."""
+    if path.lower().endswith(".wav") and _is_pcm16(path):
+        frames, rate = _read_wav(path)
+    elif FFMPEG_PATH is not None:
+        frames, rate = _read_ffmpeg(path, sample_rate, timeout)
+    else:
+        raise ValueError("ffmpeg is required to decode this format")
+    if not len(frames):
+        raise ValueError("No audio samples")
+
+    # Loudest channel per frame, then the loudest frame per bucket
+    magnitudes = np.abs(frames.astype(np.int32)).max(axis=1)
+    buckets = min(peak_count, len(magnitudes))
+    magnitudes = np.pad(magnitudes, (0, -len(magnitudes) % buckets))
+    peaks = magnitudes.reshape(buckets, -1).max(axis=1)
+    scaled = np.minimum(peaks * 127 // 32767, 127).astype(np.int8)
+    return scaled.tobytes(), round(len(frames) * 1000 / rate)
+
+
+def _is_pcm16(path: str) -> bool:
+    try:
+        with wave.open(path, "rb") as wav:
+            return wav.getsampwidth() == 2
+    except (wave.Error, EOFError):
+        return False
@@ -0,0 +1,116 @@
+# File: backend/app/cache.py
+"""
+AI-SUMMARY: In-process caches for rarely-written, frequently-read responses.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from itertools import chain
+from typing import Any, Hashable, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Genre
+
+
+class VersionedJSONCache:
+    """
+    A single pre-encoded JSON body plus its ETag.
+    Writers call invalidate(), which bumps the version; a reader that started
+    building before the bump is not allowed to store its (now stale) result.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._entry: Optional[Tuple[bytes, str]] = None
+
+    def get(self) -> Optional[Tuple[bytes, str]]:
+        return self._entry
+
+    def set(self, version: int, body: bytes) -> Tuple[bytes, str]:
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        if version == self.version:
+            self._entry = (body, etag)
+        return body, etag
+
+    def invalidate(self) -> None:
+        self.version += 1
+        self._entry = None
+
+
+class TTLCache:
+    """Bounded mapping with per-entry expiry and least-recently-used eviction."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+genre_tree_cache = VersionedJSONCache()
+
+# Windowed/decayed hot tags per (window, decay, limit); cleared on every tag
+# counter flush, otherwise refreshed at most every TTL seconds
+hot_tags_cache = TTLCache(maxsize=64, ttl=settings.HOT_TAGS_CACHE_SECONDS)
+
+
+def mark_genres_changed(session) -> None:
+    """Flag a session whose Core-level writes (no ORM objects) touched genres."""
+    session.info["genres_changed"] = True
+
+
+# Invalidate after the writing transaction commits, so a concurrent reader can
+# never re-cache the pre-commit tree once the new one is visible.
+@event.listens_for(Session, "after_flush")
+def _track_genre_writes(session, flush_context):
+    if any(
+        isinstance(obj, Genre)
+        for obj in chain(session.new, session.dirty, session.deleted)
+    ):
+        session.info["genres_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_genre_tree(session):
+    if session.info.pop("genres_changed", False):
+        genre_tree_cache.invalidate()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_genre_writes(session, previous_transaction):
+    session.info.pop("genres_changed", None)
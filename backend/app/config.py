@@ -17,10 +17,23 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///./data/music_prompt_box.db"
+    DB_ECHO: bool = False  # log every SQL statement (expensive; independent of DEBUG)
+    DB_WRITE_POOL_SIZE: int = 1  # SQLite has a single writer; queue in-process instead of on the lock
+    DB_READ_POOL_SIZE: int = 4
+
+    # SQLite PRAGMAs applied to every new connection
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KIB: int = 65536
+    SQLITE_MMAP_SIZE: int = 268435456
+    SQLITE_TEMP_STORE: str = "MEMORY"
 
     # Storage
     STORAGE_PATH: Path = Path("./storage")
     AUDIO_PATH: Path = Path("./storage/audio")
+    # Uploaded clips go to AUDIO_PATH/uploads (AUDIO_PATH must be inside STORAGE_PATH)
+    AUDIO_UPLOAD_MAX_BYTES: int = 100 * 1024 * 1024
 
     # Frontend dist (served in production)
     FRONTEND_DIST_PATH: Path = Path("../frontend/dist")
@@ -32,6 +45,60 @@ class Settings(BaseSettings):
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
 
+    # Copy counters (write-behind); interval 0 writes every copy immediately
+    COPY_COUNTER_FLUSH_INTERVAL_MS: int = 1000
+    COPY_COUNTER_FLUSH_MAX_EVENTS: int = 500
+
+    # Hot tags: hourly copy buckets older than this are pruned (>= largest window)
+    TAG_BUCKET_RETENTION_DAYS: int = 31
+    HOT_TAGS_CACHE_SECONDS: int = 30
+    HOT_TAGS_INDEX_SIZE: int = 100  # all-time top tags kept in memory (>= max ?limit)
+
+    # Background import jobs: uploads are spooled to STORAGE_PATH/imports
+    IMPORT_MAX_BYTES: int = 512 * 1024 * 1024
+    IMPORT_JOB_TTL_SECONDS: int = 3600  # finished jobs are forgotten after this
+
+    # Outbound HTTP (iTunes proxy, seed scripts): one pooled client per process
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 20
+    HTTP_CLIENT_MAX_KEEPALIVE: int = 10
+    HTTP_CLIENT_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_CLIENT_CONNECT_TIMEOUT: float = 5.0
+    HTTP_CLIENT_READ_TIMEOUT: float = 10.0
+    HTTP_CLIENT_HTTP2: bool = True  # needs the 'h2' package, else HTTP/1.1
+
+    # Outbound iTunes calls (API and seeds); Apple allows roughly 20 per minute
+    ITUNES_RATE_LIMIT_PER_MINUTE: float = 20
+    ITUNES_RATE_LIMIT_BURST: int = 10
+    ITUNES_MAX_RETRIES: int = 3
+    ITUNES_RETRY_BASE_DELAY_SECONDS: float = 1.0
+
+    # iTunes proxy response cache; empty results use the shorter negative TTL
+    ITUNES_CACHE_MAX_ENTRIES: int = 2048
+    ITUNES_CACHE_SEARCH_TTL_SECONDS: int = 6 * 3600
+    ITUNES_CACHE_LOOKUP_TTL_SECONDS: int = 24 * 3600
+    ITUNES_CACHE_NEGATIVE_TTL_SECONDS: int = 600
+    ITUNES_CACHE_PERSIST: bool = False  # also keep entries in SQLite across restarts
+
+    # Local copies of remote previews/artwork, content-addressed, LRU-evicted
+    MEDIA_CACHE_ENABLED: bool = True
+    MEDIA_CACHE_PATH: Path = Path("./storage/audio/cache")
+    MEDIA_CACHE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024
+    MEDIA_CACHE_MAX_FILE_BYTES: int = 20 * 1024 * 1024
+    MEDIA_CACHE_MAX_AGE_SECONDS: int = 3600  # Cache-Control for served copies
+    # Only these hosts (and their subdomains) are fetched: iTunes previews/artwork
+    MEDIA_CACHE_ALLOWED_HOSTS: list[str] = ["mzstatic.com", "itunes.apple.com"]
+    MEDIA_CACHE_MAX_REDIRECTS: int = 3
+
+    # Waveform peaks for the player, decoded in a process pool (needs NumPy;
+    # formats other than 16-bit WAV also need ffmpeg on PATH)
+    WAVEFORM_PEAK_COUNT: int = 200
+    WAVEFORM_SAMPLE_RATE: int = 8000
+    WAVEFORM_WORKERS: int = 2
+    WAVEFORM_DECODE_TIMEOUT_SECONDS: float = 60.0
+
+    # Delta exports: tombstones are kept this long; older ?since= values are refused
+    DELETION_LOG_RETENTION_DAYS: int = 90
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
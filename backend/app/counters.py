@@ -0,0 +1,256 @@
+# File: backend/app/counters.py
+"""
+AI-SUMMARY: Write-behind buffer for style and tag copy counters.
+Copy clicks are aggregated in memory and flushed as batched increments,
+so bursts of copies cost one short write transaction instead of one each.
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import bindparam, delete, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.cache import hot_tags_cache
+from app.config import settings
+from app.database import AsyncReadSessionLocal, AsyncSessionLocal
+from app.models import Style, TagStat, TagCopyBucket
+
+logger = logging.getLogger(__name__)
+
+styles_table = Style.__table__
+
+
+def normalize_tags(tags: Iterable[str]) -> List[str]:
+    """Lower-case and trim tags, dropping blanks and duplicates (order kept)."""
+    return list(dict.fromkeys(t for t in (tag.lower().strip() for tag in tags) if t))
+
+
+def tag_stat_upsert(rows: List[dict]):
+    """
+    Multi-row INSERT ... ON CONFLICT(tag) DO UPDATE adding each row's
+    copy_count to the stored one. Rows need tag, copy_count and last_copied_at.
+    """
+    stmt = sqlite_insert(TagStat).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=["tag"],
+        set_={
+            "copy_count": TagStat.copy_count + stmt.excluded.copy_count,
+            "last_copied_at": stmt.excluded.last_copied_at,
+        },
+    )
+
+
+def hour_bucket(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def tag_bucket_upsert(rows: List[dict]):
+    """Multi-row upsert adding copy_count into (tag, bucket_start) hourly buckets."""
+    stmt = sqlite_insert(TagCopyBucket).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=["tag", "bucket_start"],
+        set_={"copy_count": TagCopyBucket.copy_count + stmt.excluded.copy_count},
+    )
+
+
+async def record_tag_counts(
+    session, counts: Dict[str, int], copied_at: Dict[str, datetime]
+) -> None:
+    """Write tag copy increments to the lifetime stats and the hourly buckets."""
+    await session.execute(
+        tag_stat_upsert(
+            [
+                {"tag": tag, "copy_count": n, "last_copied_at": copied_at[tag]}
+                for tag, n in counts.items()
+            ]
+        )
+    )
+    await session.execute(
+        tag_bucket_upsert(
+            [
+                {
+                    "tag": tag,
+                    "bucket_start": hour_bucket(copied_at[tag]),
+                    "copy_count": n,
+                }
+                for tag, n in counts.items()
+            ]
+        )
+    )
+
+
+async def prune_tag_buckets(session, now: datetime) -> None:
+    cutoff = now - timedelta(days=settings.TAG_BUCKET_RETENTION_DAYS)
+    await session.execute(
+        delete(TagCopyBucket).where(TagCopyBucket.bucket_start < cutoff)
+    )
+
+
+class HotTagIndex:
+    """
+    All-time top tags by copy_count, kept in memory. Counts only ever grow,
+    so a tag can only move up by being copied: after each committed batch,
+    re-reading just the batch's tags keeps the top `size` exact.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._top: Optional[Dict[str, TagStat]] = None
+        self._lock = asyncio.Lock()
+
+    async def top(self, limit: int) -> List[TagStat]:
+        async with self._lock:
+            if self._top is None:
+                async with AsyncReadSessionLocal() as session:
+                    result = await session.execute(
+                        select(TagStat)
+                        .where(TagStat.copy_count > 0)
+                        .order_by(TagStat.copy_count.desc())
+                        .limit(self.size)
+                    )
+                    self._top = {t.tag: t for t in result.scalars()}
+            return self._ranked()[:limit]
+
+    async def apply(self, tags: Iterable[str]) -> None:
+        """Fold the committed counts of tags into the index."""
+        tags = list(tags)
+        async with self._lock:
+            if self._top is None or not tags:
+                return  # loaded fresh on first read
+            async with AsyncReadSessionLocal() as session:
+                result = await session.execute(select(TagStat).where(TagStat.tag.in_(tags)))
+                self._top.update((t.tag, t) for t in result.scalars())
+            self._top = {t.tag: t for t in self._ranked()[: self.size]}
+
+    def reset(self) -> None:
+        self._top = None
+
+    def _ranked(self) -> List[TagStat]:
+        return sorted(self._top.values(), key=lambda t: (-t.copy_count, t.tag))
+
+
+async def tag_counts_committed(tags: Iterable[str]) -> None:
+    """Refresh hot tag views after tag copies were committed."""
+    # Windowed and decayed rankings are recomputed on next read
+    hot_tags_cache.clear()
+    try:
+        await hot_tag_index.apply(tags)
+    except Exception:
+        logger.exception("Hot tag index refresh failed; reloading on next read")
+        hot_tag_index.reset()
+
+
+class CopyCounterBuffer:
+    def __init__(self, flush_interval_ms: int, max_pending: int):
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_pending = max_pending
+        self._styles: Counter = Counter()
+        self._tags: Counter = Counter()
+        self._tags_last_copied: Dict[str, datetime] = {}
+        self._pending = 0
+        self._wakeup = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._last_prune_hour: Optional[datetime] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.flush_interval > 0
+
+    def add_style(self, style_id: str) -> None:
+        self._styles[style_id] += 1
+        self._note_pending(1)
+
+    def add_tags(self, tags: Iterable[str]) -> None:
+        now = datetime.utcnow()
+        added = 0
+        for tag in tags:
+            self._tags[tag] += 1
+            self._tags_last_copied[tag] = now
+            added += 1
+        self._note_pending(added)
+
+    def _note_pending(self, count: int) -> None:
+        self._pending += count
+        if self._pending >= self.max_pending:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        # Let the loop finish any flush in progress instead of cancelling it
+        # mid-write, then persist whatever is still buffered.
+        if self._task is not None:
+            self._stopping.set()
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._stopping.is_set():
+                return
+            await self.flush()
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            # Swap the buffers out before the first await so copies recorded
+            # during the write land in the next batch.
+            styles, self._styles = self._styles, Counter()
+            tags, self._tags = self._tags, Counter()
+            tags_last_copied, self._tags_last_copied = self._tags_last_copied, {}
+            self._pending = 0
+            if not styles and not tags:
+                return
+
+            try:
+                async with AsyncSessionLocal() as session:
+                    if styles:
+                        await session.execute(
+                            update(styles_table)
+                            .where(styles_table.c.id == bindparam("style_id"))
+                            .values(copy_count=styles_table.c.copy_count + bindparam("n")),
+                            [{"style_id": k, "n": n} for k, n in styles.items()],
+                        )
+                    if tags:
+                        await record_tag_counts(session, tags, tags_last_copied)
+                        now = datetime.utcnow()
+                        if self._last_prune_hour != hour_bucket(now):
+                            await prune_tag_buckets(session, now)
+                            self._last_prune_hour = hour_bucket(now)
+                    await session.commit()
+            except BaseException as e:
+                # Also on cancellation: the swapped-out counts exist nowhere else
+                if isinstance(e, Exception):
+                    logger.exception("Copy counter flush failed; re-queueing increments")
+                self._styles.update(styles)
+                self._tags.update(tags)
+                for tag, copied_at in tags_last_copied.items():
+                    self._tags_last_copied.setdefault(tag, copied_at)
+                self._pending += sum(styles.values()) + sum(tags.values())
+                if not isinstance(e, Exception):
+                    raise
+            else:
+                if tags:
+                    await tag_counts_committed(tags)
+
+
+hot_tag_index = HotTagIndex(size=settings.HOT_TAGS_INDEX_SIZE)
+
+copy_counter = CopyCounterBuffer(
+    flush_interval_ms=settings.COPY_COUNTER_FLUSH_INTERVAL_MS,
+    max_pending=settings.COPY_COUNTER_FLUSH_MAX_EVENTS,
+)
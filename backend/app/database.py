@@ -1,27 +1,89 @@
 # File: backend/app/database.py
 
 from collections.abc import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+    async_sessionmaker,
+)
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import settings
 
+_is_sqlite = settings.DATABASE_URL.startswith("sqlite")
 
+# Writes go through a small dedicated pool; reads use their own pool so that
+# in WAL mode they never queue behind the writer. Connections are pooled
+# (aiosqlite defaults to NullPool) so PRAGMAs and the worker thread are set
+# up once per connection rather than once per request.
 engine = create_async_engine(
     settings.DATABASE_URL,
-    echo=settings.DEBUG,
+    echo=settings.DB_ECHO,
     future=True,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=settings.DB_WRITE_POOL_SIZE,
+    max_overflow=0,
 )
 
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
+read_engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=settings.DB_ECHO,
+    future=True,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=settings.DB_READ_POOL_SIZE,
+    max_overflow=settings.DB_READ_POOL_SIZE,
 )
 
 
+def _half_life_weight(age_hours: float, half_life_hours: float) -> float:
+    return 0.5 ** (max(age_hours, 0.0) / half_life_hours)
+
+
+def _configure_connection(dbapi_connection, read_only: bool) -> None:
+    if not _is_sqlite:
+        return
+    dbapi_connection.create_function(
+        "half_life_weight", 2, _half_life_weight, deterministic=True
+    )
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode = {settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout = {int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA cache_size = -{int(settings.SQLITE_CACHE_SIZE_KIB)}")
+    cursor.execute(f"PRAGMA mmap_size = {int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.execute(f"PRAGMA temp_store = {settings.SQLITE_TEMP_STORE}")
+    if read_only:
+        cursor.execute("PRAGMA query_only = ON")
+    cursor.close()
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _on_write_connect(dbapi_connection, connection_record):
+    _configure_connection(dbapi_connection, read_only=False)
+
+
+@event.listens_for(read_engine.sync_engine, "connect")
+def _on_read_connect(dbapi_connection, connection_record):
+    _configure_connection(dbapi_connection, read_only=True)
+
+
+def _sessionmaker(bind: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(
+        bind,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+
+AsyncSessionLocal = _sessionmaker(engine)
+AsyncReadSessionLocal = _sessionmaker(read_engine)
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -38,6 +100,15 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Session on the read-only pool, for handlers that never write."""
+    async with AsyncReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
 async def init_db():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -45,3 +116,4 @@ async def init_db():
 
 async def close_db():
     await engine.dispose()
+    await read_engine.dispose()
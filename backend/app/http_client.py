@@ -0,0 +1,77 @@
+# File: backend/app/http_client.py
+"""
+AI-SUMMARY: One pooled httpx.AsyncClient for outbound calls (iTunes proxy and
+seed scripts), so keep-alive connections are reused instead of paying a TCP
+and TLS handshake per request.
+"""
+
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  (httpx needs it for HTTP/2)
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def build_http_client() -> httpx.AsyncClient:
+    http2 = settings.HTTP_CLIENT_HTTP2 and HTTP2_AVAILABLE
+    if settings.HTTP_CLIENT_HTTP2 and not HTTP2_AVAILABLE:
+        logger.warning("HTTP/2 requested but 'h2' is not installed; using HTTP/1.1")
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE,
+            keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            settings.HTTP_CLIENT_READ_TIMEOUT,
+            connect=settings.HTTP_CLIENT_CONNECT_TIMEOUT,
+        ),
+        headers={"User-Agent": f"{settings.APP_NAME}/{settings.APP_VERSION}"},
+    )
+
+
+async def start_http_client() -> None:
+    global _client
+    if _client is None:
+        _client = build_http_client()
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Dependency for the app-lifetime client (started in the lifespan hook)."""
+    if _client is None:
+        raise RuntimeError("HTTP client is not started")
+    return _client
+
+
+@asynccontextmanager
+async def shared_http_client() -> AsyncIterator[httpx.AsyncClient]:
+    """
+    The app-lifetime client when running inside the app, otherwise a
+    temporary one with the same pool settings (seed scripts).
+    """
+    if _client is not None:
+        yield _client
+        return
+    async with build_http_client() as client:
+        yield client
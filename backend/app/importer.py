@@ -0,0 +1,329 @@
+# File: backend/app/importer.py
+"""
+AI-SUMMARY: Set-based import pipeline for version 1.0 library exports.
+Rows are fed one at a time, buffered, and written with batched executemany
+inserts; existence checks use ID sets loaded once per table. Background
+overwrites fill staging tables batch by batch and swap them in at the end.
+"""
+
+import json
+import logging
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional, Set
+from sqlalchemy import Column, MetaData, Table, delete, insert, select, text, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import mark_genres_changed
+from app.models import Genre, Style, Folder, FolderStyle, StyleTag
+from app.models.genre_closure import GenreClosure, rebuild_genre_closure
+from app.models.style_fts import STYLES_FTS_TABLE
+
+logger = logging.getLogger(__name__)
+
+IMPORT_BATCH_SIZE = 500
+SUPPORTED_VERSIONS = ("1.0",)
+
+# Columns that must be present and non-null in every imported row
+REQUIRED_FIELDS = {
+    "genres": ("id", "name"),
+    "styles": ("id", "name"),
+    "folders": ("id", "name"),
+}
+
+
+# Staging copies of the library tables (columns only: no FKs, indexes or
+# triggers). Kept off Base.metadata so init_db never creates them.
+_staging_metadata = MetaData()
+
+
+def _staging_table(model) -> Table:
+    source = model.__table__
+    return Table(
+        f"import_staging_{source.name}",
+        _staging_metadata,
+        *(
+            Column(
+                c.name,
+                c.type,
+                primary_key=c.primary_key,
+                nullable=c.nullable,
+                default=c.default.arg if c.default is not None else None,
+            )
+            for c in source.columns
+        ),
+    )
+
+
+# Parents before children, the order batches are flushed and swapped in
+STAGING_TABLES = {model: _staging_table(model) for model in (Genre, Style, Folder, FolderStyle)}
+
+
+class InvalidRow(ValueError):
+    """An import row that cannot be written (not an object, or a required field missing)."""
+
+
+def validate_row(kind: str, row) -> dict:
+    if not isinstance(row, dict):
+        raise InvalidRow(f"{kind} row is not an object")
+    missing = [name for name in REQUIRED_FIELDS[kind] if row.get(name) in (None, "")]
+    if missing:
+        raise InvalidRow(f"{kind} row {row.get('id')!r} is missing {', '.join(missing)}")
+    return row
+
+
+def _get(row: dict, key: str, default):
+    """row[key], treating an explicit null like a missing key."""
+    value = row.get(key)
+    return default if value is None else value
+
+
+@dataclass
+class ImportProgress:
+    genres_imported: int = 0
+    styles_imported: int = 0
+    folders_imported: int = 0
+    memberships_imported: int = 0
+    rows_skipped: int = 0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class LibraryImporter:
+    """
+    Usage: await prepare(), feed rows with add_genre/add_style/add_folder,
+    then await finish(). Everything runs in the caller's transaction unless
+    commit_each_batch is set, which releases the write lock between batches.
+    An overwrite with commit_each_batch writes its batches to staging tables
+    and only replaces the library in finish(), in one short INSERT ... SELECT
+    transaction, so a failed import leaves the library untouched; call
+    discard() to drop the staging tables after a failure.
+    Rows failing validate_row raise InvalidRow and are not written.
+
+    With upsert set (applying a delta export) existing rows are updated
+    instead of skipped, a folder's memberships are replaced by the incoming
+    ones, and apply_deletions() removes tombstoned rows.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        mode: str,
+        on_progress: Optional[Callable[[ImportProgress], None]] = None,
+        batch_size: int = IMPORT_BATCH_SIZE,
+        commit_each_batch: bool = False,
+        upsert: bool = False,
+    ):
+        self.db = db
+        self.mode = mode
+        self.on_progress = on_progress
+        self.batch_size = batch_size
+        self.commit_each_batch = commit_each_batch
+        self.upsert = upsert
+        self.staged = mode == "overwrite" and commit_each_batch
+        self.progress = ImportProgress()
+        self._genre_ids: Set[str] = set()
+        self._style_ids: Set[str] = set()
+        self._folder_ids: Set[str] = set()
+        self._genres_changed = False
+        # Folders whose memberships are replaced at the next flush (upsert only)
+        self._replace_memberships: List[str] = []
+        self._pending: Dict[str, List[dict]] = {
+            "genres": [],
+            "styles": [],
+            "folders": [],
+            "folder_styles": [],
+        }
+
+    async def prepare(self) -> None:
+        if self.staged:
+            conn = await self.db.connection()
+            # Leftovers of an import that died before discard() are dropped too
+            await conn.run_sync(_staging_metadata.drop_all)
+            await conn.run_sync(_staging_metadata.create_all)
+            await self.db.commit()
+            return
+        if self.mode == "overwrite":
+            await self._clear_library()
+            return
+        for model, ids in (
+            (Genre, self._genre_ids),
+            (Style, self._style_ids),
+            (Folder, self._folder_ids),
+        ):
+            result = await self.db.execute(select(model.id))
+            ids.update(result.scalars().all())
+
+    async def _clear_library(self) -> None:
+        # Empty the trigger-maintained side tables first so the per-row
+        # delete triggers on styles have nothing to scan.
+        await self.db.execute(text(f"DELETE FROM {STYLES_FTS_TABLE}"))
+        for model in (StyleTag, FolderStyle, Style, Folder, GenreClosure, Genre):
+            await self.db.execute(delete(model))
+
+    def _skip(self) -> None:
+        self.progress.rows_skipped += 1
+
+    async def apply_deletions(self, deleted: Dict[str, List[str]]) -> None:
+        """Delete tombstoned genres, styles and folders (before any rows are added)."""
+        style_ids = deleted.get("styles", [])
+        folder_ids = deleted.get("folders", [])
+        genre_ids = deleted.get("genres", [])
+        # No FK enforcement in SQLite here, so mirror the ORM cascades by hand
+        for chunk in _chunks(style_ids):
+            await self.db.execute(delete(FolderStyle).where(FolderStyle.style_id.in_(chunk)))
+            await self.db.execute(delete(Style).where(Style.id.in_(chunk)))
+        for chunk in _chunks(folder_ids):
+            await self.db.execute(delete(FolderStyle).where(FolderStyle.folder_id.in_(chunk)))
+            await self.db.execute(delete(Folder).where(Folder.id.in_(chunk)))
+        for chunk in _chunks(genre_ids):
+            await self.db.execute(
+                update(Style).where(Style.genre_id.in_(chunk)).values(genre_id=None)
+            )
+            await self.db.execute(delete(Genre).where(Genre.id.in_(chunk)))
+        self._style_ids.difference_update(style_ids)
+        self._folder_ids.difference_update(folder_ids)
+        self._genre_ids.difference_update(genre_ids)
+        if genre_ids:
+            self._genres_changed = True
+
+    async def add_genre(self, row: dict) -> None:
+        validate_row("genres", row)
+        values = {
+            "id": row["id"],
+            "name": row["name"],
+            "parent_id": row.get("parent_id"),
+            "level": _get(row, "level", 1),
+            "sort_order": _get(row, "sort_order", 0),
+            "description": row.get("description"),
+            "era_prompt": row.get("era_prompt"),
+        }
+        if values["id"] in self._genre_ids and not self.upsert:
+            return self._skip()
+        self._genre_ids.add(values["id"])
+        await self._queue("genres", values)
+        self.progress.genres_imported += 1
+        self._genres_changed = True
+
+    async def add_style(self, row: dict) -> None:
+        validate_row("styles", row)
+        values = {
+            "id": row["id"],
+            "name": row["name"],
+            "tags_json": json.dumps(_get(row, "tags", []), ensure_ascii=False),
+            "genre_id": row.get("genre_id"),
+            "description": row.get("description"),
+            "bpm_range": row.get("bpm_range"),
+            "audio_type": row.get("audio_type"),
+            "audio_source": row.get("audio_source"),
+            "reference_url": row.get("reference_url"),
+            "copy_count": _get(row, "copy_count", 0),
+        }
+        if values["id"] in self._style_ids and not self.upsert:
+            return self._skip()
+        self._style_ids.add(values["id"])
+        await self._queue("styles", values)
+        self.progress.styles_imported += 1
+
+    async def add_folder(self, row: dict) -> None:
+        validate_row("folders", row)
+        values = {"id": row["id"], "name": row["name"]}
+        if values["id"] in self._folder_ids and not self.upsert:
+            return self._skip()
+        self._folder_ids.add(values["id"])
+        if self.upsert:
+            self._replace_memberships.append(values["id"])
+        await self._queue("folders", values)
+        self.progress.folders_imported += 1
+
+        # Memberships reference styles imported earlier in the document or
+        # already in the library; anything else is dropped.
+        for style_id in dict.fromkeys(_get(row, "style_ids", [])):
+            if style_id in self._style_ids:
+                await self._queue(
+                    "folder_styles", {"folder_id": row["id"], "style_id": style_id}
+                )
+                self.progress.memberships_imported += 1
+
+    async def _queue(self, kind: str, values: dict) -> None:
+        pending = self._pending[kind]
+        pending.append(values)
+        if len(pending) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        # Parents before children, so a partially imported batch stays consistent
+        for kind, model in (
+            ("genres", Genre),
+            ("styles", Style),
+            ("folders", Folder),
+            ("folder_styles", FolderStyle),
+        ):
+            if kind == "folder_styles" and self._replace_memberships:
+                for chunk in _chunks(self._replace_memberships):
+                    await self.db.execute(
+                        delete(FolderStyle).where(FolderStyle.folder_id.in_(chunk))
+                    )
+                self._replace_memberships = []
+            rows = self._pending[kind]
+            if rows:
+                target = STAGING_TABLES[model] if self.staged else model.__table__
+                await self.db.execute(self._insert_statement(target, rows[0]), rows)
+                self._pending[kind] = []
+        if self.commit_each_batch:
+            await self.db.commit()
+        if self.on_progress:
+            self.on_progress(self.progress)
+
+    def _insert_statement(self, table: Table, sample: dict):
+        stmt = sqlite_insert(table)
+        if not self.upsert or table is FolderStyle.__table__:
+            return stmt.on_conflict_do_nothing()
+        # excluded.updated_at is the insert default (now), marking the row changed
+        columns = [name for name in sample if name != "id"] + ["updated_at"]
+        return stmt.on_conflict_do_update(
+            index_elements=["id"],
+            set_={name: stmt.excluded[name] for name in columns},
+        )
+
+    async def finish(self) -> ImportProgress:
+        await self.flush()
+        if self.staged:
+            await self._swap_in_staged()
+        if self._genres_changed or self.mode == "overwrite":
+            conn = await self.db.connection()
+            await conn.run_sync(rebuild_genre_closure)
+            mark_genres_changed(self.db)
+            if self.commit_each_batch:
+                await self.db.commit()
+        return self.progress
+
+
+    async def _swap_in_staged(self) -> None:
+        """Replace the library with the staged rows; the caller commits."""
+        await self._clear_library()
+        for model, staging in STAGING_TABLES.items():
+            columns = [c.name for c in staging.columns]
+            await self.db.execute(
+                insert(model.__table__).from_select(columns, select(staging))
+            )
+        conn = await self.db.connection()
+        await conn.run_sync(_staging_metadata.drop_all)
+
+    async def discard(self) -> None:
+        """Drop the staging tables of a failed staged import."""
+        if self.staged:
+            await self.db.rollback()
+            conn = await self.db.connection()
+            await conn.run_sync(_staging_metadata.drop_all)
+            await self.db.commit()
+
+
+def _chunks(ids: List[str], size: int = IMPORT_BATCH_SIZE):
+    for start in range(0, len(ids), size):
+        yield ids[start : start + size]
+
+
+def log_progress(progress: ImportProgress) -> None:
+    logger.info("Import progress: %s", progress.as_dict())
@@ -0,0 +1,130 @@
+# File: backend/app/itunes_api.py
+"""
+AI-SUMMARY: Outbound iTunes Search API calls shared by the proxy router and
+the seed scripts: identical in-flight requests are coalesced, all requests
+pass a token-bucket limiter, and 403/429/5xx responses are retried with
+exponential backoff (honouring Retry-After).
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+ITUNES_SEARCH_URL = "https://itunes.apple.com/search"
+ITUNES_LOOKUP_URL = "https://itunes.apple.com/lookup"
+
+# Apple answers throttling with 403 as well as 429
+RETRY_STATUSES = {403, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Allows `rate` requests per second on average with bursts up to `burst`.
+    Callers queue in arrival order while the bucket is empty.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        # Holding the lock while sleeping keeps waiters first-come, first-served
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                wait = max(self._paused_until - now, 0.0)
+                if not wait and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep(wait or (1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller back, e.g. after the upstream signalled throttling."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+
+
+class SingleFlight:
+    """Runs one call per key at a time; concurrent callers share its result."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        # A caller giving up must not cancel the call others are waiting on
+        return await asyncio.shield(task)
+
+
+itunes_limiter = TokenBucket(
+    rate=settings.ITUNES_RATE_LIMIT_PER_MINUTE / 60,
+    burst=settings.ITUNES_RATE_LIMIT_BURST,
+)
+_in_flight = SingleFlight()
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+async def _get_json_with_retry(client: httpx.AsyncClient, url: str, params: dict) -> dict:
+    attempt = 0
+    while True:
+        await itunes_limiter.acquire()
+        try:
+            resp = await client.get(url, params=params)
+            if resp.status_code not in RETRY_STATUSES:
+                resp.raise_for_status()
+                return resp.json()
+            error: httpx.HTTPError = httpx.HTTPStatusError(
+                f"iTunes returned {resp.status_code}", request=resp.request, response=resp
+            )
+            delay = _retry_after(resp)
+            if resp.status_code in (403, 429):
+                itunes_limiter.pause(delay or settings.ITUNES_RETRY_BASE_DELAY_SECONDS)
+        except httpx.TransportError as e:
+            error, delay = e, None
+
+        if attempt >= settings.ITUNES_MAX_RETRIES:
+            raise error
+        if delay is None:
+            delay = settings.ITUNES_RETRY_BASE_DELAY_SECONDS * 2**attempt
+            delay *= random.uniform(0.5, 1.5)
+        attempt += 1
+        logger.warning("iTunes request failed (%s); retry %d in %.1fs", error, attempt, delay)
+        await asyncio.sleep(delay)
+
+
+async def fetch_itunes_json(client: httpx.AsyncClient, url: str, params: dict) -> dict:
+    """
+    GET an iTunes endpoint and return the decoded JSON. Raises httpx.HTTPError
+    once retries are exhausted.
+    """
+    key = (url, tuple(sorted((k, str(v)) for k, v in params.items())))
+    return await _in_flight.do(key, lambda: _get_json_with_retry(client, url, params))
@@ -0,0 +1,107 @@
+# File: backend/app/itunes_cache.py
+"""
+AI-SUMMARY: Response cache for the iTunes proxy. An in-memory TTL/LRU cache
+keyed on normalized request parameters, optionally written through to SQLite
+and reloaded on startup so it survives restarts.
+"""
+
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.cache import TTLCache
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import ITunesCacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+def search_cache_key(search_term: str, country: str, entity: str, limit: int) -> str:
+    # iTunes matching is case- and whitespace-insensitive
+    term = " ".join(search_term.lower().split())
+    return f"search|{country.upper()}|{entity}|{limit}|{term}"
+
+
+def lookup_cache_key(track_id: int) -> str:
+    return f"lookup|{track_id}"
+
+
+class ITunesResponseCache:
+    def __init__(self, maxsize: int, negative_ttl: float, persist: bool):
+        self.negative_ttl = negative_ttl
+        self.persist = persist
+        # Every set() passes its own TTL; the default is unused
+        self._memory = TTLCache(maxsize=maxsize, ttl=negative_ttl)
+
+    def get(self, key: str) -> Optional[dict]:
+        return self._memory.get(key)
+
+    async def set(self, key: str, body: dict, ttl: float) -> None:
+        if not body.get("result_count"):
+            ttl = min(ttl, self.negative_ttl)
+        self._memory.set(key, body, ttl=ttl)
+        if not self.persist:
+            return
+        try:
+            async with AsyncSessionLocal() as session:
+                stmt = sqlite_insert(ITunesCacheEntry).values(
+                    key=key,
+                    body=json.dumps(body, ensure_ascii=False),
+                    expires_at=datetime.utcnow() + timedelta(seconds=ttl),
+                )
+                await session.execute(
+                    stmt.on_conflict_do_update(
+                        index_elements=["key"],
+                        set_={
+                            "body": stmt.excluded.body,
+                            "expires_at": stmt.excluded.expires_at,
+                        },
+                    )
+                )
+                await session.commit()
+        except Exception:
+            # The in-memory entry is enough to serve this process
+            logger.exception("Failed to persist iTunes cache entry %s", key)
+
+    async def load(self) -> None:
+        """Drop expired persisted entries and warm memory with the freshest rest."""
+        if not self.persist:
+            return
+        now = datetime.utcnow()
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                delete(ITunesCacheEntry).where(ITunesCacheEntry.expires_at <= now)
+            )
+            await session.commit()
+            result = await session.execute(
+                select(ITunesCacheEntry)
+                .order_by(ITunesCacheEntry.expires_at.desc())
+                .limit(self._memory.maxsize)
+            )
+            # Oldest first, so the freshest entries end up most recently used
+            for entry in reversed(result.scalars().all()):
+                ttl = (entry.expires_at - now).total_seconds()
+                self._memory.set(entry.key, json.loads(entry.body), ttl=ttl)
+
+    def stats(self) -> dict:
+        lookups = self._memory.hits + self._memory.misses
+        return {
+            "entries": len(self._memory),
+            "max_entries": self._memory.maxsize,
+            "hits": self._memory.hits,
+            "misses": self._memory.misses,
+            "hit_rate": round(self._memory.hits / lookups, 3) if lookups else None,
+            "persistent": self.persist,
+        }
+
+
+itunes_cache = ITunesResponseCache(
+    maxsize=settings.ITUNES_CACHE_MAX_ENTRIES,
+    negative_ttl=settings.ITUNES_CACHE_NEGATIVE_TTL_SECONDS,
+    persist=settings.ITUNES_CACHE_PERSIST,
+)
@@ -0,0 +1,113 @@
+# File: backend/app/itunes_ranking.py
+"""
+AI-SUMMARY: Scores iTunes search results as preview candidates for a style.
+Results from several searches are pooled, de-duplicated by trackId and ranked
+by genre acceptance, token overlap with the searches and release year versus
+the style's decade. Shared by /api/itunes/suggest and the rematch seed script.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_DECADE_RE = re.compile(r"\b((?:19|20)\d0)s\b")
+
+GENRE_WEIGHT = 3.0
+OVERLAP_WEIGHT = 4.0
+ARTIST_IN_QUERY_BONUS = 2.0
+DECADE_WEIGHT = 2.0
+# Reissues and compilations carry later dates, so near misses still count
+DECADE_NEAR_YEARS = 5
+REPEAT_HIT_BONUS = 0.5
+
+
+@dataclass
+class ScoredTrack:
+    track: dict
+    score: float
+    reasons: Dict[str, float] = field(default_factory=dict)
+
+
+def tokens(text: str) -> set:
+    return set(_TOKEN_RE.findall(text.lower()))
+
+
+def genre_decade(names: Iterable[str]) -> Optional[int]:
+    """First decade named in genre names/IDs, e.g. 'genre_1970s_funk' -> 1970."""
+    for name in names:
+        match = _DECADE_RE.search(name.replace("_", " "))
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def release_year(track: dict) -> Optional[int]:
+    release_date = track.get("releaseDate") or ""
+    return int(release_date[:4]) if release_date[:4].isdigit() else None
+
+
+def score_track(
+    track: dict,
+    queries: Sequence[str],
+    accept_genres: Sequence[str] = (),
+    decade: Optional[int] = None,
+) -> ScoredTrack:
+    reasons: Dict[str, float] = {}
+
+    if accept_genres and track.get("primaryGenreName") in accept_genres:
+        reasons["genre"] = GENRE_WEIGHT
+
+    # Share of the track's own words that the searches asked for
+    track_tokens = tokens(f"{track.get('trackName', '')} {track.get('artistName', '')}")
+    query_tokens = set().union(*(tokens(q) for q in queries)) if queries else set()
+    if track_tokens:
+        overlap = len(track_tokens & query_tokens) / len(track_tokens)
+        if overlap:
+            reasons["overlap"] = round(OVERLAP_WEIGHT * overlap, 3)
+
+    artist = track.get("artistName", "").lower()
+    if artist and any(artist in q.lower() for q in queries):
+        reasons["artist"] = ARTIST_IN_QUERY_BONUS
+
+    year = release_year(track)
+    if decade is not None and year is not None:
+        if decade <= year < decade + 10:
+            reasons["decade"] = DECADE_WEIGHT
+        elif decade - DECADE_NEAR_YEARS <= year < decade + 10 + DECADE_NEAR_YEARS:
+            reasons["decade"] = DECADE_WEIGHT / 2
+
+    return ScoredTrack(track=track, score=sum(reasons.values()), reasons=reasons)
+
+
+def rank_candidates(
+    result_lists: Iterable[List[dict]],
+    queries: Sequence[str],
+    accept_genres: Sequence[str] = (),
+    decade: Optional[int] = None,
+) -> List[ScoredTrack]:
+    """
+    Pool results from several searches, keep one entry per trackId and
+    return them best first. Tracks surfaced by more than one search get a
+    small bonus. Ties keep search order.
+    """
+    pooled: Dict[int, dict] = {}
+    hits: Dict[int, int] = {}
+    for results in result_lists:
+        for track in results:
+            track_id = track.get("trackId")
+            if track_id is None:
+                continue
+            pooled.setdefault(track_id, track)
+            hits[track_id] = hits.get(track_id, 0) + 1
+
+    ranked = []
+    for track_id, track in pooled.items():
+        scored = score_track(track, queries, accept_genres, decade)
+        if hits[track_id] > 1:
+            bonus = REPEAT_HIT_BONUS * (hits[track_id] - 1)
+            scored.reasons["repeat"] = bonus
+            scored.score += bonus
+        ranked.append(scored)
+    ranked.sort(key=lambda s: s.score, reverse=True)
+    return ranked
@@ -0,0 +1,184 @@
+# File: backend/app/jobs.py
+"""
+AI-SUMMARY: Background import jobs. An uploaded export is spooled to
+STORAGE_PATH/imports, parsed incrementally with ijson and fed to the
+LibraryImporter, committing per batch so other writers can interleave.
+Overwrites are staged and swapped in at the end, so they stay atomic.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import aiofiles
+import ijson
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.importer import InvalidRow, LibraryImporter, ImportProgress, SUPPORTED_VERSIONS
+
+logger = logging.getLogger(__name__)
+
+MAX_RECORDED_ERRORS = 100
+
+# (ijson prefix, importer method) in the order sections must be applied
+IMPORT_SECTIONS = [
+    ("data.genres.item", "add_genre"),
+    ("data.styles.item", "add_style"),
+    ("data.folders.item", "add_folder"),
+]
+
+
+@dataclass
+class ImportJob:
+    id: str
+    mode: str
+    path: Path
+    status: str = "queued"  # queued | running | succeeded | failed
+    bytes_received: int = 0
+    rows_processed: int = 0
+    progress: ImportProgress = field(default_factory=ImportProgress)
+    errors: List[str] = field(default_factory=list)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    _started: Optional[float] = None
+    _finished: Optional[float] = None
+
+    @property
+    def rows_per_second(self) -> Optional[float]:
+        if self._started is None:
+            return None
+        elapsed = (self._finished or time.monotonic()) - self._started
+        return round(self.rows_processed / elapsed, 1) if elapsed > 0 else None
+
+    def record_error(self, message: str) -> None:
+        if len(self.errors) < MAX_RECORDED_ERRORS:
+            self.errors.append(message)
+
+
+_jobs: Dict[str, ImportJob] = {}
+_tasks: Set[asyncio.Task] = set()
+# SQLite has one writer; run imports one after another
+_import_lock = asyncio.Lock()
+
+
+def _evict_finished_jobs() -> None:
+    """Forget jobs that finished more than IMPORT_JOB_TTL_SECONDS ago."""
+    cutoff = time.monotonic() - settings.IMPORT_JOB_TTL_SECONDS
+    for job_id in [j.id for j in _jobs.values() if j._finished is not None and j._finished < cutoff]:
+        del _jobs[job_id]
+
+
+def get_job(job_id: str) -> Optional[ImportJob]:
+    _evict_finished_jobs()
+    return _jobs.get(job_id)
+
+
+def create_job(mode: str) -> ImportJob:
+    _evict_finished_jobs()
+    job_id = uuid.uuid4().hex[:12]
+    imports_dir = settings.STORAGE_PATH / "imports"
+    imports_dir.mkdir(parents=True, exist_ok=True)
+    job = ImportJob(id=job_id, mode=mode, path=imports_dir / f"{job_id}.json")
+    _jobs[job_id] = job
+    return job
+
+
+async def spool_upload(job: ImportJob, chunks, max_bytes: int) -> None:
+    """Write the request body to the job's file chunk by chunk."""
+    async with aiofiles.open(job.path, "wb") as f:
+        async for chunk in chunks:
+            job.bytes_received += len(chunk)
+            if job.bytes_received > max_bytes:
+                raise ValueError(f"Upload exceeds {max_bytes} bytes")
+            await f.write(chunk)
+
+
+def start_job(job: ImportJob) -> None:
+    task = asyncio.create_task(_run_job(job))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+async def _read_header(
+    path: Path,
+) -> Tuple[Optional[str], Optional[str], Dict[str, List[str]]]:
+    """One streaming pass for version, the delta watermark and tombstones."""
+    version, since = None, None
+    deleted: Dict[str, List[str]] = {}
+    async with aiofiles.open(path, "rb") as f:
+        async for prefix, event, value in ijson.parse_async(f):
+            if prefix == "version" and event == "string":
+                version = value
+            elif prefix == "since" and event == "string":
+                since = value
+            elif prefix.startswith("deleted.") and event == "string":
+                deleted.setdefault(prefix.split(".")[1], []).append(value)
+    return version, since, deleted
+
+
+async def _run_job(job: ImportJob) -> None:
+    async with _import_lock:
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        job._started = time.monotonic()
+        try:
+            version, since, deleted = await _read_header(job.path)
+            if version not in SUPPORTED_VERSIONS:
+                raise ValueError(f"Unsupported version: {version}")
+            is_delta = since is not None
+            if is_delta and job.mode != "merge":
+                raise ValueError("A delta export can only be applied with mode=merge")
+
+            async with AsyncSessionLocal() as session:
+                importer = LibraryImporter(
+                    session,
+                    job.mode,
+                    on_progress=lambda progress: setattr(job, "progress", progress),
+                    # Per-batch commits let other writers interleave; an
+                    # overwrite batches into staging tables and swaps at the end
+                    commit_each_batch=True,
+                    upsert=is_delta,
+                )
+                try:
+                    await importer.prepare()
+                    if is_delta:
+                        await importer.apply_deletions(deleted)
+                    for prefix, method in IMPORT_SECTIONS:
+                        add_row = getattr(importer, method)
+                        # One incremental pass per section keeps memory flat and
+                        # applies parents before children regardless of key order.
+                        async with aiofiles.open(job.path, "rb") as f:
+                            async for row in ijson.items_async(f, prefix, use_float=True):
+                                job.rows_processed += 1
+                                try:
+                                    await add_row(row)
+                                except InvalidRow as e:
+                                    importer.progress.rows_skipped += 1
+                                    job.record_error(f"row {job.rows_processed}: {e}")
+                                except (KeyError, TypeError) as e:
+                                    importer.progress.rows_skipped += 1
+                                    job.record_error(
+                                        f"{prefix} row {job.rows_processed}: invalid ({e!r})"
+                                    )
+                    job.progress = await importer.finish()
+                    await session.commit()
+                except Exception:
+                    # Cancelled imports leave staging tables for the next prepare()
+                    await importer.discard()
+                    raise
+            job.status = "succeeded"
+        except Exception as e:
+            logger.exception("Import job %s failed", job.id)
+            job.record_error(str(e))
+            job.status = "failed"
+        finally:
+            job.finished_at = datetime.utcnow()
+            job._finished = time.monotonic()
+            job.path.unlink(missing_ok=True)
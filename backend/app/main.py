@@ -1,13 +1,20 @@
 # File: backend/app/main.py
 
 from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.config import settings
-from app.database import init_db, close_db
+from app.counters import copy_counter
+from app.database import engine, init_db, close_db
+from app.http_client import start_http_client, close_http_client
+from app.itunes_cache import itunes_cache
+from app.media_cache import media_cache
+from app.waveforms import waveform_service
+from app.models.deletion_log import prune_deletion_log
 from app.routers import (
     genres_router,
     styles_router,
@@ -15,15 +22,27 @@ from app.routers import (
     tags_router,
     data_router,
     itunes_router,
+    upload_router,
 )
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    async with engine.begin() as conn:
+        cutoff = datetime.utcnow() - timedelta(days=settings.DELETION_LOG_RETENTION_DAYS)
+        await conn.run_sync(prune_deletion_log, cutoff)
     settings.STORAGE_PATH.mkdir(parents=True, exist_ok=True)
     settings.AUDIO_PATH.mkdir(parents=True, exist_ok=True)
+    await copy_counter.start()
+    await start_http_client()
+    await itunes_cache.load()
+    await media_cache.start()
     yield
+    await waveform_service.stop()
+    await media_cache.stop()
+    await close_http_client()
+    await copy_counter.stop()
     await close_db()
 
 
@@ -47,6 +66,7 @@ app.include_router(folders_router)
 app.include_router(tags_router)
 app.include_router(data_router)
 app.include_router(itunes_router)
+app.include_router(upload_router)
 
 app.mount("/storage", StaticFiles(directory=str(settings.STORAGE_PATH)), name="storage")
 
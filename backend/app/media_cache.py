@@ -0,0 +1,293 @@
+# File: backend/app/media_cache.py
+"""
+AI-SUMMARY: Local cache of remote preview audio and artwork. Misses are queued
+for a background fetcher that streams the file to disk, names it by SHA-256
+(identical content is stored once) and evicts least-recently-used entries
+beyond MEDIA_CACHE_MAX_BYTES. Cached files are served with HTTP Range support.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+import aiofiles
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import bindparam, delete, func, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.cache import etag_matches
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.http_client import shared_http_client
+from app.models import MediaCacheEntry
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def is_remote_url(url: Optional[str]) -> bool:
+    return bool(url) and urlparse(url).scheme in ("http", "https")
+
+
+def is_allowed_media_url(url: Optional[str]) -> bool:
+    """
+    Whether the server may fetch url: http(s) on the default port to a host in
+    MEDIA_CACHE_ALLOWED_HOSTS. URLs come from user-editable style fields, so
+    anything else (internal hosts, metadata endpoints) is never requested.
+    """
+    if not is_remote_url(url):
+        return False
+    parsed = urlparse(url)
+    try:
+        port = parsed.port
+    except ValueError:
+        return False
+    host = (parsed.hostname or "").lower().rstrip(".")
+    if parsed.username or parsed.password or port not in (None, 80, 443):
+        return False
+    return any(
+        host == allowed or host.endswith("." + allowed)
+        for allowed in settings.MEDIA_CACHE_ALLOWED_HOSTS
+    )
+
+
+class MediaCache:
+    def __init__(self, root: Path, max_bytes: int, max_file_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._queued: Set[str] = set()
+        # Access times are batched into the next write instead of one per play
+        self._accessed: Dict[str, datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if settings.MEDIA_CACHE_ENABLED and self._task is None:
+            self.root.mkdir(parents=True, exist_ok=True)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def get(self, session, url: str) -> Optional[Tuple[Path, MediaCacheEntry]]:
+        """
+        The cached file for url, or None (a miss queues a fetch). Looked up on
+        the caller's session so a request never holds two read connections.
+        """
+        entry = await session.get(MediaCacheEntry, url)
+        if entry is not None:
+            path = self.root / entry.path
+            if path.exists():
+                self._accessed[url] = datetime.utcnow()
+                return path, entry
+        self.enqueue(url)
+        return None
+
+    def enqueue(self, url: str) -> None:
+        if self._task is not None and url not in self._queued:
+            self._queued.add(url)
+            self._queue.put_nowait(url)
+
+    async def _run(self) -> None:
+        while True:
+            url = await self._queue.get()
+            try:
+                await self.fetch(url)
+            except Exception:
+                logger.exception("Media cache fetch failed for %s", url)
+            finally:
+                self._queued.discard(url)
+
+    async def fetch(self, url: str) -> None:
+        tmp_path = self.root / f".{uuid.uuid4().hex}.part"
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            async with shared_http_client() as client:
+                # Redirects are followed by hand so every hop is checked
+                source = url
+                for _ in range(settings.MEDIA_CACHE_MAX_REDIRECTS + 1):
+                    if not is_allowed_media_url(source):
+                        logger.warning("Not caching %s: host not allowed (%s)", url, source)
+                        return
+                    async with client.stream("GET", source, follow_redirects=False) as resp:
+                        if resp.is_redirect:
+                            source = str(resp.url.join(resp.headers["location"]))
+                            continue
+                        resp.raise_for_status()
+                        content_type = resp.headers.get("content-type", "application/octet-stream")
+                        async with aiofiles.open(tmp_path, "wb") as f:
+                            async for chunk in resp.aiter_bytes(CHUNK_SIZE):
+                                size += len(chunk)
+                                if size > self.max_file_bytes:
+                                    logger.warning("Not caching %s: larger than %d bytes", url, self.max_file_bytes)
+                                    return
+                                digest.update(chunk)
+                                await f.write(chunk)
+                        break
+                else:
+                    logger.warning("Not caching %s: too many redirects", url)
+                    return
+
+            sha256 = digest.hexdigest()
+            suffix = Path(urlparse(url).path).suffix[:10]
+            relative = f"{sha256[:2]}/{sha256}{suffix}"
+            target = self.root / relative
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if target.exists():
+                tmp_path.unlink()  # same content already cached under another URL
+            else:
+                os.replace(tmp_path, target)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        now = datetime.utcnow()
+        async with AsyncSessionLocal() as session:
+            stmt = sqlite_insert(MediaCacheEntry).values(
+                url=url,
+                sha256=sha256,
+                path=relative,
+                size=size,
+                content_type=content_type,
+                fetched_at=now,
+                last_accessed_at=now,
+            )
+            await session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["url"],
+                    set_={
+                        name: stmt.excluded[name]
+                        for name in ("sha256", "path", "size", "content_type", "fetched_at")
+                    },
+                )
+            )
+            await self._write_access_times(session)
+            await self._evict(session)
+            await session.commit()
+
+    async def _write_access_times(self, session) -> None:
+        accessed, self._accessed = self._accessed, {}
+        if accessed:
+            table = MediaCacheEntry.__table__
+            await session.execute(
+                update(table)
+                .where(table.c.url == bindparam("entry_url"))
+                .values(last_accessed_at=bindparam("accessed_at")),
+                [{"entry_url": u, "accessed_at": t} for u, t in accessed.items()],
+            )
+
+    async def _evict(self, session) -> None:
+        """Drop least-recently-used entries until the distinct files fit max_bytes."""
+        # Shared files are counted once
+        files = select(MediaCacheEntry.sha256, func.max(MediaCacheEntry.size).label("size")).group_by(
+            MediaCacheEntry.sha256
+        )
+        total = (await session.execute(select(func.coalesce(func.sum(files.subquery().c.size), 0)))).scalar_one()
+        if total <= self.max_bytes:
+            return
+
+        result = await session.execute(
+            select(MediaCacheEntry.url, MediaCacheEntry.sha256, MediaCacheEntry.path, MediaCacheEntry.size)
+            .order_by(MediaCacheEntry.last_accessed_at)
+        )
+        for url, sha256, path, size in result.all():
+            if total <= self.max_bytes:
+                break
+            await session.execute(delete(MediaCacheEntry).where(MediaCacheEntry.url == url))
+            still_used = (
+                await session.execute(
+                    select(MediaCacheEntry.url).where(MediaCacheEntry.sha256 == sha256).limit(1)
+                )
+            ).first()
+            if not still_used:
+                (self.root / path).unlink(missing_ok=True)
+                total -= size
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """(start, end) inclusive for a single 'bytes=' range; None if unsatisfiable."""
+    match = _RANGE_RE.match(header.strip())
+    if not match or not any(match.groups()) or size == 0:
+        return None
+    first, last = match.groups()
+    if not first:  # suffix range: the last N bytes
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start > end or start >= size:
+        return None
+    return start, end
+
+
+async def _iter_file(path: Path, start: int, length: int) -> AsyncIterator[bytes]:
+    async with aiofiles.open(path, "rb") as f:
+        await f.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = await f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def serve_cached_file(request: Request, path: Path, entry: MediaCacheEntry) -> Response:
+    """Serve a cached file honouring If-None-Match and a single byte Range."""
+    size = path.stat().st_size
+    etag = f'"{entry.sha256[:32]}"'
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.MEDIA_CACHE_MAX_AGE_SECONDS}",
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if range_header and request.headers.get("if-range", etag) == etag:
+        byte_range = _parse_range(range_header, size)
+        if byte_range is None:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+        start, end = byte_range
+        length = end - start + 1
+        return StreamingResponse(
+            _iter_file(path, start, length),
+            status_code=206,
+            media_type=entry.content_type,
+            headers={
+                **headers,
+                "Content-Range": f"bytes {start}-{end}/{size}",
+                "Content-Length": str(length),
+            },
+        )
+
+    return StreamingResponse(
+        _iter_file(path, 0, size),
+        media_type=entry.content_type,
+        headers={**headers, "Content-Length": str(size)},
+    )
+
+
+media_cache = MediaCache(
+    root=settings.MEDIA_CACHE_PATH,
+    max_bytes=settings.MEDIA_CACHE_MAX_BYTES,
+    max_file_bytes=settings.MEDIA_CACHE_MAX_FILE_BYTES,
+)
@@ -1,8 +1,30 @@
 # File: backend/app/models/__init__.py
 
 from app.models.genre import Genre
+from app.models.genre_closure import GenreClosure
 from app.models.style import Style
 from app.models.folder import Folder, FolderStyle
-from app.models.tag_stat import TagStat
+from app.models.tag_stat import TagStat, TagCopyBucket
+from app.models.style_tag import StyleTag, normalize_style_tag
+from app.models.style_fts import styles_fts
+from app.models.deletion_log import DeletionLog
+from app.models.itunes_cache import ITunesCacheEntry
+from app.models.media_cache import MediaCacheEntry
+from app.models.waveform import Waveform
 
-__all__ = ["Genre", "Style", "Folder", "FolderStyle", "TagStat"]
+__all__ = [
+    "Genre",
+    "GenreClosure",
+    "Style",
+    "Folder",
+    "FolderStyle",
+    "TagStat",
+    "TagCopyBucket",
+    "StyleTag",
+    "normalize_style_tag",
+    "styles_fts",
+    "DeletionLog",
+    "ITunesCacheEntry",
+    "MediaCacheEntry",
+    "Waveform",
+]
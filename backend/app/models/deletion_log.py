@@ -0,0 +1,72 @@
+# File: backend/app/models/deletion_log.py
+
+from datetime import datetime
+from sqlalchemy import Connection, String, Integer, DateTime, event, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+# Tables whose deletions are logged for incremental (delta) exports
+TRACKED_TABLES = ("genres", "styles", "folders")
+
+# Same text format SQLAlchemy uses for DateTime on SQLite (microseconds)
+_SQLITE_NOW = "strftime('%Y-%m-%d %H:%M:%f', 'now') || '000'"
+
+
+class DeletionLog(Base):
+    """
+    Tombstones for deleted genres, styles and folders, written by SQLite
+    triggers so every delete path (ORM, Core, seed scripts) is captured.
+    """
+
+    __tablename__ = "deletion_log"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    table_name: Mapped[str] = mapped_column(String(50), nullable=False)
+    row_id: Mapped[str] = mapped_column(String(50), nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+
+
+CHANGE_TRACKING_TRIGGERS = [
+    *(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS deletion_log_{table}_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO deletion_log (table_name, row_id, deleted_at)
+            VALUES ('{table}', old.id, {_SQLITE_NOW});
+        END
+        """
+        for table in TRACKED_TABLES
+    ),
+    # A folder's exported style_ids change with its memberships, so membership
+    # writes count as an update of the folder.
+    f"""
+    CREATE TRIGGER IF NOT EXISTS folder_styles_touch_ai AFTER INSERT ON folder_styles BEGIN
+        UPDATE folders SET updated_at = {_SQLITE_NOW} WHERE id = new.folder_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS folder_styles_touch_ad AFTER DELETE ON folder_styles BEGIN
+        UPDATE folders SET updated_at = {_SQLITE_NOW} WHERE id = old.folder_id;
+    END
+    """,
+]
+
+
+def create_change_tracking(connection: Connection) -> None:
+    for statement in CHANGE_TRACKING_TRIGGERS:
+        connection.execute(text(statement))
+
+
+def prune_deletion_log(connection: Connection, cutoff: datetime) -> int:
+    """Drop tombstones older than cutoff. Returns rows removed."""
+    result = connection.execute(
+        text("DELETE FROM deletion_log WHERE deleted_at < :cutoff"), {"cutoff": cutoff}
+    )
+    return result.rowcount
+
+
+# Triggers reference other tables, so install them once the whole schema exists
+@event.listens_for(Base.metadata, "after_create")
+def _create_change_tracking_after_create(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        create_change_tracking(connection)
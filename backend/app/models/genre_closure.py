@@ -0,0 +1,89 @@
+# File: backend/app/models/genre_closure.py
+
+from typing import Optional
+from sqlalchemy import Connection, String, Integer, ForeignKey, event, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+# Guards the recursive rebuild against accidental parent_id cycles
+MAX_GENRE_DEPTH = 32
+
+
+class GenreClosure(Base):
+    """
+    Ancestry closure of the genre tree: one row per (ancestor, descendant)
+    pair, including each genre paired with itself at depth 0.
+    """
+
+    __tablename__ = "genre_closure"
+
+    ancestor_id: Mapped[str] = mapped_column(
+        String(50), ForeignKey("genres.id", ondelete="CASCADE"), primary_key=True
+    )
+    descendant_id: Mapped[str] = mapped_column(
+        String(50),
+        ForeignKey("genres.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+    depth: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+def rebuild_genre_closure(connection: Connection) -> int:
+    """Recompute the whole closure from genres.parent_id. Returns rows written."""
+    connection.execute(text("DELETE FROM genre_closure"))
+    connection.execute(
+        text(
+            """
+            WITH RECURSIVE tree(ancestor_id, descendant_id, depth) AS (
+                SELECT id, id, 0 FROM genres
+                UNION ALL
+                SELECT tree.ancestor_id, genres.id, tree.depth + 1
+                FROM tree JOIN genres ON genres.parent_id = tree.descendant_id
+                WHERE tree.depth < :max_depth
+            )
+            INSERT OR IGNORE INTO genre_closure (ancestor_id, descendant_id, depth)
+            SELECT ancestor_id, descendant_id, depth FROM tree
+            """
+        ),
+        {"max_depth": MAX_GENRE_DEPTH},
+    )
+    return connection.execute(text("SELECT count(*) FROM genre_closure")).scalar_one()
+
+
+def insert_genre_closure(
+    connection: Connection, genre_id: str, parent_id: Optional[str]
+) -> None:
+    """Add closure rows for a new leaf genre: itself plus every ancestor of its parent."""
+    connection.execute(
+        text(
+            """
+            INSERT OR IGNORE INTO genre_closure (ancestor_id, descendant_id, depth)
+            SELECT ancestor_id, :genre_id, depth + 1
+            FROM genre_closure WHERE descendant_id = :parent_id
+            UNION ALL
+            SELECT :genre_id, :genre_id, 0
+            """
+        ),
+        {"genre_id": genre_id, "parent_id": parent_id},
+    )
+
+
+def delete_genre_closure(connection: Connection, genre_id: str) -> None:
+    """Remove closure rows for a genre and its whole subtree."""
+    connection.execute(
+        text(
+            """
+            DELETE FROM genre_closure WHERE descendant_id IN (
+                SELECT descendant_id FROM genre_closure WHERE ancestor_id = :genre_id
+            )
+            """
+        ),
+        {"genre_id": genre_id},
+    )
+
+
+@event.listens_for(GenreClosure.__table__, "after_create")
+def _backfill_genre_closure_after_create(target, connection, **kw):
+    rebuild_genre_closure(connection)
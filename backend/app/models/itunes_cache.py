@@ -0,0 +1,17 @@
+# File: backend/app/models/itunes_cache.py
+
+from datetime import datetime
+from sqlalchemy import String, Text, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class ITunesCacheEntry(Base):
+    """Persisted iTunes proxy responses, reloaded into memory on startup."""
+
+    __tablename__ = "itunes_cache"
+
+    key: Mapped[str] = mapped_column(String(500), primary_key=True)
+    body: Mapped[str] = mapped_column(Text, nullable=False)  # JSON
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
@@ -0,0 +1,26 @@
+# File: backend/app/models/media_cache.py
+
+from datetime import datetime
+from sqlalchemy import String, Integer, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class MediaCacheEntry(Base):
+    """
+    A remote preview or artwork URL cached under MEDIA_CACHE_PATH. Files are
+    named by content hash, so several URLs can share one file.
+    """
+
+    __tablename__ = "media_cache"
+
+    url: Mapped[str] = mapped_column(String(1000), primary_key=True)
+    sha256: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    path: Mapped[str] = mapped_column(String(200), nullable=False)  # relative to MEDIA_CACHE_PATH
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+    content_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    last_accessed_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, index=True
+    )
@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import Optional, List, TYPE_CHECKING
 import json
-from sqlalchemy import String, Integer, Text, DateTime, ForeignKey, event
+from sqlalchemy import String, Integer, Text, DateTime, ForeignKey, Index, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -15,6 +15,8 @@ if TYPE_CHECKING:
 
 class Style(Base):
     __tablename__ = "styles"
+    # Supports keyset pagination on (created_at desc, id desc)
+    __table_args__ = (Index("ix_styles_created_at_id", "created_at", "id"),)
 
     id: Mapped[str] = mapped_column(String(50), primary_key=True)
     name: Mapped[str] = mapped_column(String(200), nullable=False, index=True)
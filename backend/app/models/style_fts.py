@@ -0,0 +1,121 @@
+# File: backend/app/models/style_fts.py
+
+import re
+from typing import Optional
+from sqlalchemy import Connection, column, event, table, text
+
+from app.database import Base
+
+# Standalone FTS5 index over the searchable Style columns. It keeps its own
+# copy of the text (rather than external content keyed on styles.rowid)
+# because styles has a string primary key and VACUUM may renumber rowids.
+# Tags are flattened from tags_json so JSON punctuation is never indexed.
+STYLES_FTS_TABLE = "styles_fts"
+
+styles_fts = table(
+    STYLES_FTS_TABLE,
+    column("style_id"),
+    column("name"),
+    column("tags"),
+    column("description"),
+    column("bpm_range"),
+)
+
+# bm25 column weights, in declaration order (style_id is UNINDEXED)
+BM25_WEIGHTS = (0.0, 10.0, 5.0, 1.0, 1.0)
+
+_TAGS_TEXT = (
+    "CASE WHEN json_valid({row}.tags_json) "
+    "THEN (SELECT group_concat(value, ' ') FROM json_each({row}.tags_json)) "
+    "ELSE {row}.tags_json END"
+)
+
+_CREATE_STATEMENTS = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {STYLES_FTS_TABLE} USING fts5(
+        style_id UNINDEXED,
+        name,
+        tags,
+        description,
+        bpm_range,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS styles_fts_ai AFTER INSERT ON styles BEGIN
+        INSERT INTO {STYLES_FTS_TABLE} (style_id, name, tags, description, bpm_range)
+        VALUES (new.id, new.name, {_TAGS_TEXT.format(row="new")},
+                new.description, new.bpm_range);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS styles_fts_ad AFTER DELETE ON styles BEGIN
+        DELETE FROM {STYLES_FTS_TABLE} WHERE style_id = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS styles_fts_au
+    AFTER UPDATE OF id, name, tags_json, description, bpm_range ON styles BEGIN
+        DELETE FROM {STYLES_FTS_TABLE} WHERE style_id = old.id;
+        INSERT INTO {STYLES_FTS_TABLE} (style_id, name, tags, description, bpm_range)
+        VALUES (new.id, new.name, {_TAGS_TEXT.format(row="new")},
+                new.description, new.bpm_range);
+    END
+    """,
+]
+
+_CJK_RE = re.compile(r"[぀-ヿ㐀-䶿一-鿿가-힯]")
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def rebuild_style_fts(connection: Connection) -> int:
+    """Repopulate the FTS index from the styles table. Returns rows indexed."""
+    connection.execute(text(f"DELETE FROM {STYLES_FTS_TABLE}"))
+    connection.execute(
+        text(
+            f"""
+            INSERT INTO {STYLES_FTS_TABLE} (style_id, name, tags, description, bpm_range)
+            SELECT id, name, {_TAGS_TEXT.format(row="styles")}, description, bpm_range
+            FROM styles
+            """
+        )
+    )
+    connection.execute(
+        text(f"INSERT INTO {STYLES_FTS_TABLE} ({STYLES_FTS_TABLE}) VALUES ('optimize')")
+    )
+    return connection.execute(
+        text(f"SELECT count(*) FROM {STYLES_FTS_TABLE}")
+    ).scalar_one()
+
+
+def create_style_fts(connection: Connection) -> None:
+    """Create the FTS table and sync triggers, backfilling if newly created."""
+    existed = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": STYLES_FTS_TABLE},
+    ).first()
+    for statement in _CREATE_STATEMENTS:
+        connection.execute(text(statement))
+    if not existed:
+        rebuild_style_fts(connection)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_style_fts_after_metadata(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        create_style_fts(connection)
+
+
+def build_match_query(search: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 prefix query ("foo"* "bar"*, implicit AND).
+    Returns None when the input has no word tokens or contains CJK text,
+    which unicode61 does not segment — callers fall back to a LIKE scan.
+    """
+    if _CJK_RE.search(search):
+        return None
+    tokens = _TOKEN_RE.findall(search.lower())
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
@@ -0,0 +1,89 @@
+# File: backend/app/models/style_tag.py
+
+import string
+
+from sqlalchemy import Connection, String, Integer, ForeignKey, Index, event, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class StyleTag(Base):
+    """
+    One row per tag of a style, normalized (lower-cased, trimmed).
+    Derived from Style.tags_json by SQLite triggers, so raw-SQL writers such as
+    the seed scripts keep it in sync too; tags_json stays the source of truth.
+    """
+
+    __tablename__ = "style_tags"
+    __table_args__ = (Index("ix_style_tags_tag_style_id", "tag", "style_id"),)
+
+    style_id: Mapped[str] = mapped_column(
+        String(50), ForeignKey("styles.id", ondelete="CASCADE"), primary_key=True
+    )
+    position: Mapped[int] = mapped_column(Integer, primary_key=True)
+    tag: Mapped[str] = mapped_column(String(100), nullable=False)
+
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def normalize_style_tag(tag: str) -> str:
+    """
+    Python twin of the triggers' lower(trim(value)). SQLite's lower() only
+    folds ASCII letters and trim() only strips spaces, so str.lower()/strip()
+    would miss stored tags such as 'Électro'.
+    """
+    return tag.strip(" ").translate(_ASCII_LOWER)
+
+
+_INSERT_TAGS = """
+    INSERT INTO style_tags (style_id, tag, position)
+    SELECT {row}.id, lower(trim(value)), key
+    FROM json_each(CASE WHEN json_valid({row}.tags_json) THEN {row}.tags_json ELSE '[]' END)
+    WHERE type = 'text' AND trim(value) != ''
+"""
+
+STYLE_TAG_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS style_tags_ai AFTER INSERT ON styles BEGIN
+        {_INSERT_TAGS.format(row="new")};
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS style_tags_ad AFTER DELETE ON styles BEGIN
+        DELETE FROM style_tags WHERE style_id = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS style_tags_au AFTER UPDATE OF id, tags_json ON styles BEGIN
+        DELETE FROM style_tags WHERE style_id = old.id;
+        {_INSERT_TAGS.format(row="new")};
+    END
+    """,
+]
+
+BACKFILL_STYLE_TAGS = [
+    "DELETE FROM style_tags",
+    """
+    INSERT INTO style_tags (style_id, tag, position)
+    SELECT styles.id, lower(trim(j.value)), j.key
+    FROM styles, json_each(
+        CASE WHEN json_valid(styles.tags_json) THEN styles.tags_json ELSE '[]' END
+    ) AS j
+    WHERE j.type = 'text' AND trim(j.value) != ''
+    """,
+]
+
+
+def rebuild_style_tags(connection: Connection) -> int:
+    """Recreate the sync triggers and repopulate style_tags. Returns rows written."""
+    for statement in STYLE_TAG_TRIGGERS + BACKFILL_STYLE_TAGS:
+        connection.execute(text(statement))
+    return connection.execute(text("SELECT count(*) FROM style_tags")).scalar_one()
+
+
+@event.listens_for(StyleTag.__table__, "after_create")
+def _backfill_style_tags_after_create(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        rebuild_style_tags(connection)
@@ -14,3 +14,13 @@ class TagStat(Base):
     tag: Mapped[str] = mapped_column(String(100), primary_key=True)
     copy_count: Mapped[int] = mapped_column(Integer, default=0, index=True)
     last_copied_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+
+class TagCopyBucket(Base):
+    """Copies of a tag within one UTC hour; feeds windowed and decayed hot tags."""
+
+    __tablename__ = "tag_copy_buckets"
+
+    tag: Mapped[str] = mapped_column(String(100), primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime, primary_key=True, index=True)
+    copy_count: Mapped[int] = mapped_column(Integer, default=0)
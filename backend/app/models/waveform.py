@@ -0,0 +1,21 @@
+# File: backend/app/models/waveform.py
+
+from datetime import datetime
+from sqlalchemy import String, Integer, LargeBinary, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class Waveform(Base):
+    """
+    Downsampled peaks of an audio file, keyed by the file's content hash so
+    styles sharing a clip share one row. peaks holds one int8 (0-127) per bucket.
+    """
+
+    __tablename__ = "waveforms"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    peaks: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    duration_ms: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
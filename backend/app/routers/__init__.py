@@ -6,6 +6,7 @@ from app.routers.folders import router as folders_router
 from app.routers.tags import router as tags_router
 from app.routers.data import router as data_router
 from app.routers.itunes import router as itunes_router
+from app.routers.upload import router as upload_router
 
 __all__ = [
     "genres_router",
@@ -14,4 +15,5 @@ __all__ = [
     "tags_router",
     "data_router",
     "itunes_router",
+    "upload_router",
 ]
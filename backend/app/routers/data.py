@@ -1,16 +1,29 @@
 # File: backend/app/routers/data.py
 
-from datetime import datetime
-from typing import Optional, Literal
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
-from sqlalchemy import select
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import select, distinct
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from app.database import get_db
-from app.models import Genre, Style, Folder, FolderStyle
+from app.config import settings
+from app.database import get_db, AsyncReadSessionLocal
+from app.importer import InvalidRow, LibraryImporter, SUPPORTED_VERSIONS, log_progress
+from app.jobs import ImportJob, create_job, get_job, spool_upload, start_job
+from app.snapshot import (
+    SNAPSHOT_MEDIA_TYPE,
+    SnapshotError,
+    SnapshotTooLarge,
+    decode_snapshot,
+    encode_snapshot,
+)
+from app.models import Genre, Style, Folder, FolderStyle, DeletionLog
+from app.models.deletion_log import TRACKED_TABLES
 
 router = APIRouter(prefix="/api/data", tags=["data"])
 
@@ -25,6 +38,187 @@ class ImportRequest(BaseModel):
     version: str
     exported_at: datetime
     data: dict
+    # Present on delta exports (?since=): the watermark and tombstoned IDs
+    since: Optional[datetime] = None
+    deleted: Optional[Dict[str, List[str]]] = None
+
+
+class ImportJobResponse(BaseModel):
+    id: str
+    mode: str
+    status: str
+    bytes_received: int
+    rows_processed: int
+    rows_per_second: Optional[float]
+    progress: Dict[str, int]
+    errors: List[str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+
+def build_job_response(job: ImportJob) -> ImportJobResponse:
+    return ImportJobResponse(
+        id=job.id,
+        mode=job.mode,
+        status=job.status,
+        bytes_received=job.bytes_received,
+        rows_processed=job.rows_processed,
+        rows_per_second=job.rows_per_second,
+        progress=job.progress.as_dict(),
+        errors=job.errors,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+EXPORT_BATCH_SIZE = 500
+
+# Delta exports re-send rows changed shortly before the watermark, covering
+# transactions that stamped updated_at before the previous export but
+# committed after it started. Re-applying a row is harmless.
+DELTA_EXPORT_OVERLAP = timedelta(seconds=5)
+
+
+def _encode(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+async def _stream_array(
+    session: AsyncSession, query, to_dict: Callable[[Any], dict]
+) -> AsyncIterator[bytes]:
+    """Yield a JSON array body (without brackets), one chunk per fetched batch."""
+    result = await session.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    first = True
+    async for rows in result.partitions():
+        chunk = b",".join(_encode(to_dict(row)) for row in rows)
+        yield chunk if first else b"," + chunk
+        first = False
+
+
+async def iter_export(
+    scope: str,
+    genre_id: Optional[str],
+    folder_id: Optional[str],
+    since: Optional[datetime] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Produce the version 1.0 export document as JSON chunks, reading each table
+    with a server-side cursor. Runs in its own session because a streamed
+    response outlives the request's dependencies.
+
+    With since, only rows updated after it are included, followed by a
+    "deleted" map of tombstoned IDs; exported_at is the next watermark.
+    """
+    changed_after = since - DELTA_EXPORT_OVERLAP if since else None
+    async with AsyncReadSessionLocal() as session:
+        header = b'{"version":"1.0","exported_at":' + _encode(
+            datetime.utcnow().isoformat()
+        )
+        if since:
+            header += b',"since":' + _encode(since.isoformat())
+        yield header + b',"data":{"genres":['
+
+        genres_query = select(
+            Genre.id,
+            Genre.name,
+            Genre.parent_id,
+            Genre.level,
+            Genre.sort_order,
+            Genre.description,
+            Genre.era_prompt,
+        ).order_by(Genre.sort_order)
+        if changed_after:
+            genres_query = genres_query.where(Genre.updated_at > changed_after)
+        async for chunk in _stream_array(session, genres_query, lambda r: r._asdict()):
+            yield chunk
+
+        yield b'],"styles":['
+
+        styles_query = select(
+            Style.id,
+            Style.name,
+            Style.tags_json,
+            Style.genre_id,
+            Style.description,
+            Style.bpm_range,
+            Style.audio_type,
+            Style.audio_source,
+            Style.reference_url,
+            Style.copy_count,
+        )
+        if scope == "genre" and genre_id:
+            styles_query = styles_query.where(Style.genre_id == genre_id)
+        elif scope == "folder" and folder_id:
+            subq = select(FolderStyle.style_id).where(FolderStyle.folder_id == folder_id)
+            styles_query = styles_query.where(Style.id.in_(subq))
+        if changed_after:
+            styles_query = styles_query.where(Style.updated_at > changed_after)
+
+        def style_to_dict(row) -> dict:
+            data = row._asdict()
+            tags_json = data.pop("tags_json")
+            return {
+                "id": data.pop("id"),
+                "name": data.pop("name"),
+                "tags": json.loads(tags_json) if tags_json else [],
+                **data,
+            }
+
+        async for chunk in _stream_array(session, styles_query, style_to_dict):
+            yield chunk
+
+        yield b'],"folders":['
+
+        # One ordered pass over folders and their memberships, grouped on the fly
+        folders_query = (
+            select(Folder.id, Folder.name, FolderStyle.style_id)
+            .outerjoin(FolderStyle, FolderStyle.folder_id == Folder.id)
+            .order_by(Folder.id, FolderStyle.added_at)
+        )
+        if changed_after:
+            # Membership writes touch folders.updated_at (see deletion_log.py)
+            folders_query = folders_query.where(Folder.updated_at > changed_after)
+        memberships = await session.stream(
+            folders_query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        current: Optional[dict] = None
+        first = True
+        async for row in memberships:
+            if current is None or current["id"] != row.id:
+                if current is not None:
+                    yield (b"" if first else b",") + _encode(current)
+                    first = False
+                current = {"id": row.id, "name": row.name, "style_ids": []}
+            if row.style_id is not None:
+                current["style_ids"].append(row.style_id)
+        if current is not None:
+            yield (b"" if first else b",") + _encode(current)
+
+        if not since:
+            yield b"]}}"
+            return
+
+        deleted = await _tombstones(session, changed_after)
+        yield b']},"deleted":' + _encode(deleted) + b"}"
+
+
+async def _tombstones(session: AsyncSession, after: datetime) -> Dict[str, List[str]]:
+    """IDs deleted after the watermark that have not been re-created since."""
+    tracked = {"genres": Genre, "styles": Style, "folders": Folder}
+    deleted = {}
+    for table_name in TRACKED_TABLES:
+        model = tracked[table_name]
+        result = await session.execute(
+            select(distinct(DeletionLog.row_id)).where(
+                DeletionLog.table_name == table_name,
+                DeletionLog.deleted_at > after,
+                DeletionLog.row_id.not_in(select(model.id)),
+            )
+        )
+        deleted[table_name] = list(result.scalars().all())
+    return deleted
 
 
 @router.get("/export")
@@ -32,182 +226,148 @@ async def export_data(
     scope: Literal["all", "genre", "folder"] = "all",
     genre_id: Optional[str] = None,
     folder_id: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    stream: bool = Query(False, description="Send the export as a chunked response"),
+    format: Literal["json", "snapshot"] = Query(
+        "json", description="json: version 1.0 document; snapshot: compact gzip backup"
+    ),
+    since: Optional[datetime] = Query(
+        None, description="Only rows changed after this watermark, plus tombstones"
+    ),
 ):
-    genres_result = await db.execute(
-        select(Genre).options(selectinload(Genre.children)).order_by(Genre.sort_order)
-    )
-    all_genres = genres_result.scalars().all()
-
-    genres_data = [
-        {
-            "id": g.id,
-            "name": g.name,
-            "parent_id": g.parent_id,
-            "level": g.level,
-            "sort_order": g.sort_order,
-            "description": g.description,
-            "era_prompt": g.era_prompt,
-        }
-        for g in all_genres
-    ]
-
-    styles_query = select(Style)
-    if scope == "genre" and genre_id:
-        styles_query = styles_query.where(Style.genre_id == genre_id)
-    elif scope == "folder" and folder_id:
-        subq = select(FolderStyle.style_id).where(FolderStyle.folder_id == folder_id)
-        styles_query = styles_query.where(Style.id.in_(subq))
-
-    styles_result = await db.execute(styles_query)
-    styles = styles_result.scalars().all()
-
-    styles_data = [
-        {
-            "id": s.id,
-            "name": s.name,
-            "tags": s.tags,
-            "genre_id": s.genre_id,
-            "description": s.description,
-            "bpm_range": s.bpm_range,
-            "audio_type": s.audio_type,
-            "audio_source": s.audio_source,
-            "reference_url": s.reference_url,
-            "copy_count": s.copy_count,
-        }
-        for s in styles
-    ]
+    if since:
+        if since.tzinfo:
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        horizon = datetime.utcnow() - timedelta(days=settings.DELETION_LOG_RETENTION_DAYS)
+        if since < horizon:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="since is older than the deletion log retention; do a full export",
+            )
 
-    folders_result = await db.execute(select(Folder))
-    folders = folders_result.scalars().all()
+    chunks = iter_export(scope, genre_id, folder_id, since)
+    if stream and format == "json":
+        return StreamingResponse(chunks, media_type="application/json")
 
-    folders_data = []
-    for folder in folders:
-        fs_result = await db.execute(
-            select(FolderStyle.style_id).where(FolderStyle.folder_id == folder.id)
-        )
-        style_ids = [row[0] for row in fs_result.all()]
-        folders_data.append(
-            {
-                "id": folder.id,
-                "name": folder.name,
-                "style_ids": style_ids,
-            }
-        )
+    body = b"".join([chunk async for chunk in chunks])
+    if format == "json":
+        return Response(content=body, media_type="application/json")
 
-    export = {
-        "version": "1.0",
-        "exported_at": datetime.utcnow().isoformat(),
-        "data": {
-            "genres": genres_data,
-            "styles": styles_data,
-            "folders": folders_data,
-        },
-    }
+    snapshot = await run_in_threadpool(lambda: encode_snapshot(json.loads(body)))
+    filename = f"music-prompt-box-{datetime.utcnow():%Y%m%d-%H%M%S}.mpbsnap"
+    return Response(
+        content=snapshot,
+        media_type=SNAPSHOT_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
-    return JSONResponse(content=export)
+
+def _import_too_large(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail
+    )
 
 
-@router.post("/import")
+async def read_import_body(request: Request, format: str) -> ImportRequest:
+    max_bytes = settings.IMPORT_MAX_BYTES
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise _import_too_large(f"Upload exceeds {max_bytes} bytes")
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            raise _import_too_large(f"Upload exceeds {max_bytes} bytes")
+    try:
+        if format == "snapshot":
+            document = await run_in_threadpool(decode_snapshot, bytes(body), max_bytes)
+            return ImportRequest.model_validate(document)
+        return ImportRequest.model_validate_json(body)
+    except SnapshotTooLarge as e:
+        raise _import_too_large(str(e))
+    except SnapshotError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
+
+@router.post(
+    "/import",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": ImportRequest.model_json_schema()},
+                SNAPSHOT_MEDIA_TYPE: {
+                    "schema": {"type": "string", "format": "binary"}
+                },
+            },
+        }
+    },
+)
 async def import_data(
-    data: ImportRequest,
+    request: Request,
     mode: Literal["overwrite", "merge"] = Query(...),
+    format: Literal["json", "snapshot"] = Query("json"),
     db: AsyncSession = Depends(get_db),
 ):
-    if data.version != "1.0":
+    data = await read_import_body(request, format)
+    if data.version not in SUPPORTED_VERSIONS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Unsupported version: {data.version}",
         )
 
-    import_data = data.data
-
-    if mode == "overwrite":
-        await db.execute(
-            select(FolderStyle).execution_options(synchronize_session="fetch")
-        )
-        for table in [FolderStyle, Style, Folder, Genre]:
-            result = await db.execute(select(table))
-            for item in result.scalars().all():
-                await db.delete(item)
-
-    genres_imported = 0
-    for genre_data in import_data.get("genres", []):
-        if mode == "merge":
-            existing = await db.execute(
-                select(Genre).where(Genre.id == genre_data["id"])
-            )
-            if existing.scalar_one_or_none():
-                continue
-
-        genre = Genre(
-            id=genre_data["id"],
-            name=genre_data["name"],
-            parent_id=genre_data.get("parent_id"),
-            level=genre_data.get("level", 1),
-            sort_order=genre_data.get("sort_order", 0),
-            description=genre_data.get("description"),
-            era_prompt=genre_data.get("era_prompt"),
+    is_delta = data.since is not None
+    if is_delta and mode != "merge":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A delta export can only be applied with mode=merge",
         )
-        db.add(genre)
-        genres_imported += 1
-
-    await db.flush()
 
-    styles_imported = 0
-    for style_data in import_data.get("styles", []):
-        if mode == "merge":
-            existing = await db.execute(
-                select(Style).where(Style.id == style_data["id"])
-            )
-            if existing.scalar_one_or_none():
-                continue
-
-        style = Style(
-            id=style_data["id"],
-            name=style_data["name"],
-            tags_json="[]",
-            genre_id=style_data.get("genre_id"),
-            description=style_data.get("description"),
-            bpm_range=style_data.get("bpm_range"),
-            audio_type=style_data.get("audio_type"),
-            audio_source=style_data.get("audio_source"),
-            reference_url=style_data.get("reference_url"),
-            copy_count=style_data.get("copy_count", 0),
+    importer = LibraryImporter(db, mode, on_progress=log_progress, upsert=is_delta)
+    try:
+        await importer.prepare()
+        if is_delta:
+            await importer.apply_deletions(data.deleted or {})
+        for genre_data in data.data.get("genres", []):
+            await importer.add_genre(genre_data)
+        for style_data in data.data.get("styles", []):
+            await importer.add_style(style_data)
+        for folder_data in data.data.get("folders", []):
+            await importer.add_folder(folder_data)
+        progress = await importer.finish()
+    except InvalidRow as e:
+        # get_db rolls the whole import back, including an overwrite's clear
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return {"message": "Import successful", **progress.as_dict()}
+
+
+@router.post(
+    "/jobs", response_model=ImportJobResponse, status_code=status.HTTP_202_ACCEPTED
+)
+async def create_import_job(
+    request: Request,
+    mode: Literal["overwrite", "merge"] = Query(...),
+):
+    """Spool the raw export body to disk and import it in the background."""
+    job = create_job(mode)
+    try:
+        await spool_upload(job, request.stream(), settings.IMPORT_MAX_BYTES)
+    except ValueError as e:
+        job.path.unlink(missing_ok=True)
+        job.status = "failed"
+        job.record_error(str(e))
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e)
         )
-        style.tags = style_data.get("tags", [])
-        db.add(style)
-        styles_imported += 1
-
-    await db.flush()
+    start_job(job)
+    return build_job_response(job)
 
-    folders_imported = 0
-    for folder_data in import_data.get("folders", []):
-        if mode == "merge":
-            existing = await db.execute(
-                select(Folder).where(Folder.id == folder_data["id"])
-            )
-            if existing.scalar_one_or_none():
-                continue
 
-        folder = Folder(
-            id=folder_data["id"],
-            name=folder_data["name"],
-        )
-        db.add(folder)
-        await db.flush()
-
-        for style_id in folder_data.get("style_ids", []):
-            style_exists = await db.execute(select(Style).where(Style.id == style_id))
-            if style_exists.scalar_one_or_none():
-                fs = FolderStyle(folder_id=folder.id, style_id=style_id)
-                db.add(fs)
-
-        folders_imported += 1
-
-    return {
-        "message": "Import successful",
-        "genres_imported": genres_imported,
-        "styles_imported": styles_imported,
-        "folders_imported": folders_imported,
-    }
+@router.get("/jobs/{job_id}", response_model=ImportJobResponse)
+async def get_import_job(job_id: str):
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return build_job_response(job)
@@ -1,64 +1,39 @@
 # File: backend/app/routers/folders.py
 
 import uuid
+from datetime import datetime
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select, func
+from sqlalchemy import select, func, delete
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models import Folder, FolderStyle, Style
-from app.schemas import FolderCreate, FolderUpdate, FolderResponse, FolderAddStyle
+from app.schemas import (
+    FolderCreate,
+    FolderUpdate,
+    FolderResponse,
+    FolderAddStyle,
+    FolderStylesBatch,
+    FolderStyleBatchResult,
+    FolderStylesBatchResponse,
+)
 
 router = APIRouter(prefix="/api/folders", tags=["folders"])
 
 
-@router.get("", response_model=List[FolderResponse])
-async def get_folders(db: AsyncSession = Depends(get_db)):
-    query = select(Folder).order_by(Folder.created_at)
-    result = await db.execute(query)
-    folders = result.scalars().all()
-
-    items = []
-    for folder in folders:
-        count_query = (
-            select(func.count())
-            .select_from(FolderStyle)
-            .where(FolderStyle.folder_id == folder.id)
-        )
-        count_result = await db.execute(count_query)
-        style_count = count_result.scalar() or 0
-
-        items.append(
-            FolderResponse(
-                id=folder.id,
-                name=folder.name,
-                style_count=style_count,
-                created_at=folder.created_at,
-                updated_at=folder.updated_at,
-            )
-        )
-
-    return items
-
-
-@router.get("/{folder_id}", response_model=FolderResponse)
-async def get_folder(folder_id: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Folder).where(Folder.id == folder_id))
-    folder = result.scalar_one_or_none()
-    if not folder:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Folder not found"
-        )
-
-    count_query = (
-        select(func.count())
-        .select_from(FolderStyle)
-        .where(FolderStyle.folder_id == folder.id)
+def folders_with_counts():
+    """Folders joined with their style count in a single grouped query."""
+    style_count = func.count(FolderStyle.style_id).label("style_count")
+    return (
+        select(Folder, style_count)
+        .outerjoin(FolderStyle, FolderStyle.folder_id == Folder.id)
+        .group_by(Folder.id)
     )
-    count_result = await db.execute(count_query)
-    style_count = count_result.scalar() or 0
 
+
+def build_folder_response(folder: Folder, style_count: int) -> FolderResponse:
     return FolderResponse(
         id=folder.id,
         name=folder.name,
@@ -68,6 +43,24 @@ async def get_folder(folder_id: str, db: AsyncSession = Depends(get_db)):
     )
 
 
+@router.get("", response_model=List[FolderResponse])
+async def get_folders(db: AsyncSession = Depends(get_read_db)):
+    result = await db.execute(folders_with_counts().order_by(Folder.created_at))
+    return [build_folder_response(folder, count) for folder, count in result.all()]
+
+
+@router.get("/{folder_id}", response_model=FolderResponse)
+async def get_folder(folder_id: str, db: AsyncSession = Depends(get_read_db)):
+    result = await db.execute(folders_with_counts().where(Folder.id == folder_id))
+    row = result.one_or_none()
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Folder not found"
+        )
+
+    return build_folder_response(*row)
+
+
 @router.post("", response_model=FolderResponse, status_code=status.HTTP_201_CREATED)
 async def create_folder(data: FolderCreate, db: AsyncSession = Depends(get_db)):
     folder = Folder(
@@ -78,13 +71,7 @@ async def create_folder(data: FolderCreate, db: AsyncSession = Depends(get_db)):
     await db.flush()
     await db.refresh(folder)
 
-    return FolderResponse(
-        id=folder.id,
-        name=folder.name,
-        style_count=0,
-        created_at=folder.created_at,
-        updated_at=folder.updated_at,
-    )
+    return build_folder_response(folder, style_count=0)
 
 
 @router.put("/{folder_id}", response_model=FolderResponse)
@@ -103,23 +90,9 @@ async def update_folder(
         setattr(folder, key, value)
 
     await db.flush()
-    await db.refresh(folder)
 
-    count_query = (
-        select(func.count())
-        .select_from(FolderStyle)
-        .where(FolderStyle.folder_id == folder.id)
-    )
-    count_result = await db.execute(count_query)
-    style_count = count_result.scalar() or 0
-
-    return FolderResponse(
-        id=folder.id,
-        name=folder.name,
-        style_count=style_count,
-        created_at=folder.created_at,
-        updated_at=folder.updated_at,
-    )
+    result = await db.execute(folders_with_counts().where(Folder.id == folder.id))
+    return build_folder_response(*result.one())
 
 
 @router.delete("/{folder_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -182,3 +155,91 @@ async def remove_style_from_folder(
         )
 
     await db.delete(folder_style)
+
+
+async def ensure_folder_exists(db: AsyncSession, folder_id: str) -> None:
+    result = await db.execute(select(Folder.id).where(Folder.id == folder_id))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Folder not found"
+        )
+
+
+@router.post("/{folder_id}/styles:batch", response_model=FolderStylesBatchResponse)
+async def add_styles_to_folder(
+    folder_id: str, data: FolderStylesBatch, db: AsyncSession = Depends(get_db)
+):
+    await ensure_folder_exists(db, folder_id)
+    style_ids = list(dict.fromkeys(data.style_ids))
+
+    existing_result = await db.execute(select(Style.id).where(Style.id.in_(style_ids)))
+    existing = set(existing_result.scalars().all())
+    members_result = await db.execute(
+        select(FolderStyle.style_id).where(
+            FolderStyle.folder_id == folder_id, FolderStyle.style_id.in_(style_ids)
+        )
+    )
+    members = set(members_result.scalars().all())
+
+    results = []
+    to_add = []
+    for style_id in style_ids:
+        if style_id not in existing:
+            results.append(FolderStyleBatchResult(style_id=style_id, status="not_found"))
+        elif style_id in members:
+            results.append(
+                FolderStyleBatchResult(style_id=style_id, status="already_in_folder")
+            )
+        else:
+            results.append(FolderStyleBatchResult(style_id=style_id, status="added"))
+            to_add.append(style_id)
+
+    if to_add:
+        now = datetime.utcnow()
+        await db.execute(
+            sqlite_insert(FolderStyle)
+            .values(
+                [
+                    {"folder_id": folder_id, "style_id": style_id, "added_at": now}
+                    for style_id in to_add
+                ]
+            )
+            .on_conflict_do_nothing()
+        )
+
+    return FolderStylesBatchResponse(
+        folder_id=folder_id, changed=len(to_add), results=results
+    )
+
+
+@router.delete("/{folder_id}/styles:batch", response_model=FolderStylesBatchResponse)
+async def remove_styles_from_folder(
+    folder_id: str, data: FolderStylesBatch, db: AsyncSession = Depends(get_db)
+):
+    await ensure_folder_exists(db, folder_id)
+    style_ids = list(dict.fromkeys(data.style_ids))
+
+    members_result = await db.execute(
+        select(FolderStyle.style_id).where(
+            FolderStyle.folder_id == folder_id, FolderStyle.style_id.in_(style_ids)
+        )
+    )
+    members = set(members_result.scalars().all())
+
+    if members:
+        await db.execute(
+            delete(FolderStyle).where(
+                FolderStyle.folder_id == folder_id, FolderStyle.style_id.in_(members)
+            )
+        )
+
+    results = [
+        FolderStyleBatchResult(
+            style_id=style_id,
+            status="removed" if style_id in members else "not_in_folder",
+        )
+        for style_id in style_ids
+    ]
+    return FolderStylesBatchResponse(
+        folder_id=folder_id, changed=len(members), results=results
+    )
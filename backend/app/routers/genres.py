@@ -1,32 +1,56 @@
 # File: backend/app/routers/genres.py
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from collections import defaultdict
+from typing import Dict, List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from pydantic import TypeAdapter
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from app.database import get_db
-from app.models import Genre
+from app.cache import genre_tree_cache, etag_matches
+from app.database import get_db, get_read_db
+from app.models import Genre, GenreClosure
+from app.models.genre_closure import (
+    insert_genre_closure,
+    delete_genre_closure,
+    rebuild_genre_closure,
+)
 from app.schemas import GenreCreate, GenreUpdate, GenreResponse, GenreTreeResponse
 
 router = APIRouter(prefix="/api/genres", tags=["genres"])
 
-
-@router.get("", response_model=List[GenreTreeResponse])
-async def get_genres_tree(db: AsyncSession = Depends(get_db)):
-    query = (
-        select(Genre)
-        .where(Genre.parent_id.is_(None))
-        .options(selectinload(Genre.children).selectinload(Genre.children))
-        .order_by(Genre.sort_order)
-    )
-    result = await db.execute(query)
-    root_genres = result.scalars().all()
-    return [build_genre_tree(g) for g in root_genres]
+_genre_tree_adapter = TypeAdapter(List[GenreTreeResponse])
 
 
-def build_genre_tree(genre: Genre) -> GenreTreeResponse:
+@router.get("", response_model=List[GenreTreeResponse])
+async def get_genres_tree(
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
+):
+    cached = genre_tree_cache.get()
+    if cached:
+        body, etag = cached
+    else:
+        version = genre_tree_cache.version
+        result = await db.execute(select(Genre).order_by(Genre.sort_order))
+        all_genres = result.scalars().all()
+
+        children_by_parent: Dict[Optional[str], List[Genre]] = defaultdict(list)
+        for genre in all_genres:
+            children_by_parent[genre.parent_id].append(genre)
+
+        tree = [build_genre_tree(g, children_by_parent) for g in children_by_parent[None]]
+        body, etag = genre_tree_cache.set(version, _genre_tree_adapter.dump_json(tree))
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def build_genre_tree(
+    genre: Genre, children_by_parent: Dict[Optional[str], List[Genre]]
+) -> GenreTreeResponse:
     return GenreTreeResponse(
         id=genre.id,
         name=genre.name,
@@ -38,14 +62,14 @@ def build_genre_tree(genre: Genre) -> GenreTreeResponse:
         created_at=genre.created_at,
         updated_at=genre.updated_at,
         children=[
-            build_genre_tree(c)
-            for c in sorted(genre.children, key=lambda x: x.sort_order)
+            build_genre_tree(c, children_by_parent)
+            for c in children_by_parent[genre.id]
         ],
     )
 
 
 @router.get("/{genre_id}", response_model=GenreResponse)
-async def get_genre(genre_id: str, db: AsyncSession = Depends(get_db)):
+async def get_genre(genre_id: str, db: AsyncSession = Depends(get_read_db)):
     result = await db.execute(select(Genre).where(Genre.id == genre_id))
     genre = result.scalar_one_or_none()
     if not genre:
@@ -74,6 +98,9 @@ async def create_genre(data: GenreCreate, db: AsyncSession = Depends(get_db)):
     db.add(genre)
     await db.flush()
     await db.refresh(genre)
+
+    conn = await db.connection()
+    await conn.run_sync(insert_genre_closure, genre.id, genre.parent_id)
     return genre
 
 
@@ -89,11 +116,38 @@ async def update_genre(
         )
 
     update_data = data.model_dump(exclude_unset=True)
+    reparented = (
+        "parent_id" in update_data and update_data["parent_id"] != genre.parent_id
+    )
+    if reparented and update_data["parent_id"]:
+        parent = await db.execute(
+            select(Genre).where(Genre.id == update_data["parent_id"])
+        )
+        if not parent.scalar_one_or_none():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Parent genre not found"
+            )
+        cycle = await db.execute(
+            select(GenreClosure).where(
+                GenreClosure.ancestor_id == genre_id,
+                GenreClosure.descendant_id == update_data["parent_id"],
+            )
+        )
+        if cycle.scalar_one_or_none():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Parent genre cannot be the genre itself or its descendant",
+            )
+
     for key, value in update_data.items():
         setattr(genre, key, value)
 
     await db.flush()
     await db.refresh(genre)
+
+    if reparented:
+        conn = await db.connection()
+        await conn.run_sync(rebuild_genre_closure)
     return genre
 
 
@@ -106,4 +160,6 @@ async def delete_genre(genre_id: str, db: AsyncSession = Depends(get_db)):
             status_code=status.HTTP_404_NOT_FOUND, detail="Genre not found"
         )
 
+    conn = await db.connection()
+    await conn.run_sync(delete_genre_closure, genre_id)
     await db.delete(genre)
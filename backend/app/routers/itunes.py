@@ -4,15 +4,22 @@ iTunes Search API proxy — search tracks and return preview URLs.
 Proxied through backend to avoid CORS issues and add genre-accurate search hints.
 """
 
-from typing import Optional, List
-from fastapi import APIRouter, Query, HTTPException
+import asyncio
+from typing import Dict, Optional, List
+from fastapi import APIRouter, Depends, Query, HTTPException
 from pydantic import BaseModel
+from sqlalchemy import select
 import httpx
 
-router = APIRouter(prefix="/api/itunes", tags=["itunes"])
+from app.config import settings
+from app.database import AsyncReadSessionLocal
+from app.http_client import get_http_client
+from app.itunes_api import ITUNES_LOOKUP_URL, ITUNES_SEARCH_URL, fetch_itunes_json
+from app.itunes_cache import itunes_cache, lookup_cache_key, search_cache_key
+from app.itunes_ranking import genre_decade, rank_candidates
+from app.models import Genre, GenreClosure, Style
 
-ITUNES_SEARCH_URL = "https://itunes.apple.com/search"
-ITUNES_LOOKUP_URL = "https://itunes.apple.com/lookup"
+router = APIRouter(prefix="/api/itunes", tags=["itunes"])
 
 
 class iTunesTrack(BaseModel):
@@ -26,6 +33,7 @@ class iTunesTrack(BaseModel):
     track_time_ms: Optional[int] = None
     primary_genre_name: Optional[str] = None
     country: Optional[str] = None
+    release_date: Optional[str] = None
 
 
 class iTunesSearchResponse(BaseModel):
@@ -33,6 +41,18 @@ class iTunesSearchResponse(BaseModel):
     tracks: List[iTunesTrack]
 
 
+class iTunesSuggestion(iTunesTrack):
+    score: float
+    score_breakdown: Dict[str, float]
+
+
+class iTunesSuggestResponse(BaseModel):
+    style_id: str
+    queries: List[str]
+    decade: Optional[int] = None
+    tracks: List[iTunesSuggestion]
+
+
 def _to_itunes_track(item: dict) -> iTunesTrack:
     """Convert raw iTunes API item to our schema."""
     artwork = item.get("artworkUrl100", "")
@@ -49,9 +69,40 @@ def _to_itunes_track(item: dict) -> iTunesTrack:
         track_time_ms=item.get("trackTimeMillis"),
         primary_genre_name=item.get("primaryGenreName"),
         country=item.get("country"),
+        release_date=item.get("releaseDate"),
     )
 
 
+def _preview_tracks(data: dict) -> List[dict]:
+    return [item for item in data.get("results", [])
+            if item.get("wrapperType") == "track" and item.get("previewUrl")]
+
+
+async def _fetch_tracks(
+    client: httpx.AsyncClient, url: str, params: dict, cache_key: str, ttl: float
+) -> iTunesSearchResponse:
+    cached = itunes_cache.get(cache_key)
+    if cached is not None:
+        return iTunesSearchResponse(**cached)
+
+    try:
+        data = await fetch_itunes_json(client, url, params)
+    except httpx.HTTPError as e:
+        raise HTTPException(
+            status_code=502,
+            detail=f"iTunes API request failed: {str(e)}"
+        )
+
+    tracks = [_to_itunes_track(item) for item in _preview_tracks(data)]
+
+    response = iTunesSearchResponse(
+        result_count=len(tracks),
+        tracks=tracks,
+    )
+    await itunes_cache.set(cache_key, response.model_dump(), ttl)
+    return response
+
+
 @router.get("/search", response_model=iTunesSearchResponse)
 async def search_tracks(
     term: str = Query(..., min_length=1, max_length=200, description="Search term, e.g. 'synthwave'"),
@@ -59,6 +110,7 @@ async def search_tracks(
     entity: str = Query("song", description="Entity type: song, musicArtist, album"),
     limit: int = Query(10, ge=1, le=25, description="Max results (1-25)"),
     genre: Optional[str] = Query(None, description="Genre hint to improve accuracy, e.g. 'Electronic'"),
+    client: httpx.AsyncClient = Depends(get_http_client),
 ):
     """
     Search iTunes Music catalog.
@@ -77,48 +129,125 @@ async def search_tracks(
         "media": "music",
     }
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        try:
-            resp = await client.get(ITUNES_SEARCH_URL, params=params)
-            resp.raise_for_status()
-        except httpx.HTTPError as e:
-            raise HTTPException(
-                status_code=502,
-                detail=f"iTunes API request failed: {str(e)}"
-            )
-
-    data = resp.json()
-    tracks = [_to_itunes_track(item) for item in data.get("results", [])
-              if item.get("wrapperType") == "track" and item.get("previewUrl")]
-
-    return iTunesSearchResponse(
-        result_count=len(tracks),
-        tracks=tracks,
+    cache_key = search_cache_key(search_term, country, entity, limit)
+    return await _fetch_tracks(
+        client,
+        ITUNES_SEARCH_URL,
+        params,
+        cache_key,
+        settings.ITUNES_CACHE_SEARCH_TTL_SECONDS,
     )
 
 
 @router.get("/lookup", response_model=iTunesSearchResponse)
 async def lookup_track(
     id: int = Query(..., description="iTunes track ID"),
+    client: httpx.AsyncClient = Depends(get_http_client),
 ):
     """Look up a specific track by iTunes track ID."""
     params = {"id": id, "entity": "song"}
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        try:
-            resp = await client.get(ITUNES_LOOKUP_URL, params=params)
-            resp.raise_for_status()
-        except httpx.HTTPError as e:
-            raise HTTPException(
-                status_code=502,
-                detail=f"iTunes API request failed: {str(e)}"
-            )
+    return await _fetch_tracks(
+        client,
+        ITUNES_LOOKUP_URL,
+        params,
+        lookup_cache_key(id),
+        settings.ITUNES_CACHE_LOOKUP_TTL_SECONDS,
+    )
 
-    data = resp.json()
-    tracks = [_to_itunes_track(item) for item in data.get("results", [])
-              if item.get("wrapperType") == "track" and item.get("previewUrl")]
 
-    return iTunesSearchResponse(
-        result_count=len(tracks),
-        tracks=tracks,
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Hit/miss counters and size of the iTunes response cache."""
+    return itunes_cache.stats()
+
+
+def _style_queries(style: Style) -> List[str]:
+    """Search terms for a style: its name, name plus leading tags, tags alone."""
+    tags = style.tags[:3]
+    queries = [style.name]
+    if tags:
+        queries.append(f"{style.name} {' '.join(tags[:2])}")
+        queries.append(" ".join(tags))
+    return list(dict.fromkeys(queries))
+
+
+def _ranking_item(track: iTunesTrack) -> dict:
+    """A cached track under the raw iTunes field names the ranking reads."""
+    return {
+        "trackId": track.track_id,
+        "trackName": track.track_name,
+        "artistName": track.artist_name,
+        "primaryGenreName": track.primary_genre_name,
+        "releaseDate": track.release_date,
+    }
+
+
+@router.get("/suggest", response_model=iTunesSuggestResponse)
+async def suggest_tracks(
+    style_id: str = Query(..., description="Style to find preview candidates for"),
+    genre: Optional[List[str]] = Query(None, description="Accepted iTunes genre names, e.g. Rock"),
+    country: str = Query("US", max_length=5),
+    limit: int = Query(10, ge=1, le=25),
+    client: httpx.AsyncClient = Depends(get_http_client),
+):
+    """
+    Rank preview candidates for a style: several searches run in parallel,
+    their results are pooled, de-duplicated and scored.
+    """
+    # The session is closed before the (rate-limited) searches go out
+    async with AsyncReadSessionLocal() as db:
+        result = await db.execute(select(Style).where(Style.id == style_id))
+        style = result.scalar_one_or_none()
+        if not style:
+            raise HTTPException(status_code=404, detail="Style not found")
+
+        decade = None
+        if style.genre_id:
+            ancestors = await db.execute(
+                select(Genre.id, Genre.name)
+                .join(GenreClosure, GenreClosure.ancestor_id == Genre.id)
+                .where(GenreClosure.descendant_id == style.genre_id)
+                .order_by(GenreClosure.depth)
+            )
+            decade = genre_decade(name for row in ancestors for name in row)
+        queries = _style_queries(style)
+
+    # Same cache entries as /search?term=<query>&entity=song&limit=25
+    responses = await asyncio.gather(*(
+        _fetch_tracks(
+            client,
+            ITUNES_SEARCH_URL,
+            {
+                "term": query,
+                "country": country,
+                "entity": "song",
+                "limit": 25,
+                "media": "music",
+            },
+            search_cache_key(query, country, "song", 25),
+            settings.ITUNES_CACHE_SEARCH_TTL_SECONDS,
+        )
+        for query in queries
+    ))
+
+    tracks = {t.track_id: t for response in responses for t in response.tracks}
+    ranked = rank_candidates(
+        [[_ranking_item(t) for t in response.tracks] for response in responses],
+        queries,
+        genre or (),
+        decade,
+    )
+    return iTunesSuggestResponse(
+        style_id=style_id,
+        queries=queries,
+        decade=decade,
+        tracks=[
+            iTunesSuggestion(
+                **tracks[scored.track["trackId"]].model_dump(),
+                score=round(scored.score, 3),
+                score_breakdown=scored.reasons,
+            )
+            for scored in ranked[:limit]
+        ],
     )
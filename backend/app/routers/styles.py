@@ -1,25 +1,79 @@
 # File: backend/app/routers/styles.py
 
+import base64
+import json
 import uuid
-from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select, func, or_
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Literal, Set, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import RedirectResponse
+from sqlalchemy import select, func, or_, and_, literal_column
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
-from app.database import get_db
-from app.models import Genre, Style, FolderStyle, Folder
-from app.schemas import StyleCreate, StyleUpdate, StyleResponse, StyleListResponse
+from app.counters import copy_counter
+from app.database import get_db, get_read_db
+from app.cache import etag_matches
+from app.media_cache import is_allowed_media_url, media_cache, serve_cached_file
+from app.models import GenreClosure, Style, FolderStyle, Folder, StyleTag, Waveform, normalize_style_tag, styles_fts
+from app.models.style_fts import STYLES_FTS_TABLE, BM25_WEIGHTS, build_match_query
+from app.schemas import StyleCreate, StyleUpdate, StyleResponse, StyleListResponse, WaveformResponse
 from app.config import settings
+from app.waveforms import content_key, waveform_service
 
 router = APIRouter(prefix="/api/styles", tags=["styles"])
 
 
-def get_all_descendant_genre_ids(genre: Genre) -> List[str]:
-    ids = [genre.id]
-    for child in genre.children:
-        ids.extend(get_all_descendant_genre_ids(child))
-    return ids
+def encode_cursor(style: Style) -> str:
+    raw = f"{style.created_at.isoformat()}|{style.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, style_id = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), style_id
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+async def get_favorited_style_ids(db: AsyncSession, style_ids: List[str]) -> Set[str]:
+    """Return the subset of style_ids that belong to at least one folder."""
+    if not style_ids:
+        return set()
+    result = await db.execute(
+        select(FolderStyle.style_id)
+        .where(FolderStyle.style_id.in_(style_ids))
+        .distinct()
+    )
+    return set(result.scalars().all())
+
+
+def build_style_response(style: Style, is_favorited: bool) -> StyleResponse:
+    """Serialize a Style whose genre relationship has been eagerly loaded."""
+    return StyleResponse(
+        id=style.id,
+        name=style.name,
+        tags=style.tags,
+        genre_id=style.genre_id,
+        genre_name=style.genre.name if style.genre else None,
+        description=style.description,
+        bpm_range=style.bpm_range,
+        audio_type=style.audio_type,
+        audio_source=style.audio_source,
+        audio_platform=style.audio_platform,
+        audio_metadata=style.audio_metadata,
+        reference_url=style.reference_url,
+        copy_count=style.copy_count,
+        is_favorited=is_favorited,
+        created_at=style.created_at,
+        updated_at=style.updated_at,
+    )
 
 
 @router.get("", response_model=StyleListResponse)
@@ -27,24 +81,38 @@ async def get_styles(
     genre_id: Optional[str] = None,
     search: Optional[str] = None,
     folder_id: Optional[str] = None,
+    tag: Optional[List[str]] = Query(None),
+    tag_mode: Literal["all", "any"] = "all",
     page: int = Query(1, ge=1),
     size: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(
+        None, description="Keyset mode: pass an empty value for the first page, then next_cursor"
+    ),
+    include_total: bool = True,
+    db: AsyncSession = Depends(get_read_db),
 ):
     query = select(Style).options(joinedload(Style.genre))
 
     if genre_id:
-        genre_result = await db.execute(
-            select(Genre)
-            .options(joinedload(Genre.children).joinedload(Genre.children))
-            .where(Genre.id == genre_id)
+        query = query.join(
+            GenreClosure, GenreClosure.descendant_id == Style.genre_id
+        ).where(GenreClosure.ancestor_id == genre_id)
+
+    order_by = [Style.created_at.desc()]
+    match_query = build_match_query(search) if search else None
+    if match_query:
+        fts_table = literal_column(STYLES_FTS_TABLE)
+        matches = (
+            select(
+                styles_fts.c.style_id,
+                func.bm25(fts_table, *BM25_WEIGHTS).label("score"),
+            )
+            .where(fts_table.op("MATCH")(match_query))
+            .subquery()
         )
-        genre = genre_result.unique().scalar_one_or_none()
-        if genre:
-            descendant_ids = get_all_descendant_genre_ids(genre)
-            query = query.where(Style.genre_id.in_(descendant_ids))
-
-    if search:
+        query = query.join(matches, matches.c.style_id == Style.id)
+        order_by.insert(0, matches.c.score)
+    elif search:
         search_pattern = f"%{search}%"
         query = query.where(
             or_(
@@ -59,49 +127,65 @@ async def get_styles(
         subq = select(FolderStyle.style_id).where(FolderStyle.folder_id == folder_id)
         query = query.where(Style.id.in_(subq))
 
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
-    query = (
-        query.order_by(Style.created_at.desc()).offset((page - 1) * size).limit(size)
-    )
-    result = await db.execute(query)
-    styles = result.unique().scalars().all()
+    tags = {normalize_style_tag(t) for t in tag or []} - {""}
+    if tags:
+        subq = select(StyleTag.style_id).where(StyleTag.tag.in_(tags))
+        if tag_mode == "all":
+            subq = subq.group_by(StyleTag.style_id).having(
+                func.count(func.distinct(StyleTag.tag)) == len(tags)
+            )
+        query = query.where(Style.id.in_(subq))
 
-    items = []
-    for style in styles:
-        folder_check = await db.execute(
-            select(FolderStyle).where(FolderStyle.style_id == style.id).limit(1)
-        )
-        is_favorited = folder_check.scalar_one_or_none() is not None
-
-        items.append(
-            StyleResponse(
-                id=style.id,
-                name=style.name,
-                tags=style.tags,
-                genre_id=style.genre_id,
-                genre_name=style.genre.name if style.genre else None,
-                description=style.description,
-                bpm_range=style.bpm_range,
-                audio_type=style.audio_type,
-                audio_source=style.audio_source,
-                audio_platform=style.audio_platform,
-                audio_metadata=style.audio_metadata,
-                reference_url=style.reference_url,
-                copy_count=style.copy_count,
-                is_favorited=is_favorited,
-                created_at=style.created_at,
-                updated_at=style.updated_at,
+    total = None
+    if include_total:
+        count_query = select(func.count()).select_from(query.subquery())
+        total_result = await db.execute(count_query)
+        total = total_result.scalar() or 0
+
+    next_cursor = None
+    if cursor is not None:
+        # Keyset mode walks (created_at, id) newest first; relevance ranking
+        # does not apply because the cursor position must be monotonic.
+        if cursor:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+            query = query.where(
+                or_(
+                    Style.created_at < cursor_created_at,
+                    and_(
+                        Style.created_at == cursor_created_at,
+                        Style.id < cursor_id,
+                    ),
+                )
             )
+        query = query.order_by(Style.created_at.desc(), Style.id.desc()).limit(size + 1)
+        result = await db.execute(query)
+        styles = result.unique().scalars().all()
+        if len(styles) > size:
+            styles = styles[:size]
+            next_cursor = encode_cursor(styles[-1])
+    else:
+        query = (
+            query.order_by(*order_by, Style.id.desc())
+            .offset((page - 1) * size)
+            .limit(size)
         )
+        result = await db.execute(query)
+        styles = result.unique().scalars().all()
 
-    return StyleListResponse(total=total, page=page, size=size, items=items)
+    favorited_ids = await get_favorited_style_ids(db, [s.id for s in styles])
+
+    items = [
+        build_style_response(style, is_favorited=style.id in favorited_ids)
+        for style in styles
+    ]
+
+    return StyleListResponse(
+        total=total, page=page, size=size, items=items, next_cursor=next_cursor
+    )
 
 
 @router.get("/{style_id}", response_model=StyleResponse)
-async def get_style(style_id: str, db: AsyncSession = Depends(get_db)):
+async def get_style(style_id: str, db: AsyncSession = Depends(get_read_db)):
     result = await db.execute(
         select(Style).options(joinedload(Style.genre)).where(Style.id == style_id)
     )
@@ -111,29 +195,8 @@ async def get_style(style_id: str, db: AsyncSession = Depends(get_db)):
             status_code=status.HTTP_404_NOT_FOUND, detail="Style not found"
         )
 
-    folder_check = await db.execute(
-        select(FolderStyle).where(FolderStyle.style_id == style.id).limit(1)
-    )
-    is_favorited = folder_check.scalar_one_or_none() is not None
-
-    return StyleResponse(
-        id=style.id,
-        name=style.name,
-        tags=style.tags,
-        genre_id=style.genre_id,
-        genre_name=style.genre.name if style.genre else None,
-        description=style.description,
-        bpm_range=style.bpm_range,
-        audio_type=style.audio_type,
-        audio_source=style.audio_source,
-        audio_platform=style.audio_platform,
-        audio_metadata=style.audio_metadata,
-        reference_url=style.reference_url,
-        copy_count=style.copy_count,
-        is_favorited=is_favorited,
-        created_at=style.created_at,
-        updated_at=style.updated_at,
-    )
+    favorited_ids = await get_favorited_style_ids(db, [style.id])
+    return build_style_response(style, is_favorited=style.id in favorited_ids)
 
 
 @router.post("", response_model=StyleResponse, status_code=status.HTTP_201_CREATED)
@@ -200,29 +263,8 @@ async def update_style(
     await db.flush()
     await db.refresh(style)
 
-    folder_check = await db.execute(
-        select(FolderStyle).where(FolderStyle.style_id == style.id).limit(1)
-    )
-    is_favorited = folder_check.scalar_one_or_none() is not None
-
-    return StyleResponse(
-        id=style.id,
-        name=style.name,
-        tags=style.tags,
-        genre_id=style.genre_id,
-        genre_name=style.genre.name if style.genre else None,
-        description=style.description,
-        bpm_range=style.bpm_range,
-        audio_type=style.audio_type,
-        audio_source=style.audio_source,
-        audio_platform=style.audio_platform,
-        audio_metadata=style.audio_metadata,
-        reference_url=style.reference_url,
-        copy_count=style.copy_count,
-        is_favorited=is_favorited,
-        created_at=style.created_at,
-        updated_at=style.updated_at,
-    )
+    favorited_ids = await get_favorited_style_ids(db, [style.id])
+    return build_style_response(style, is_favorited=style.id in favorited_ids)
 
 
 @router.delete("/{style_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -239,6 +281,15 @@ async def delete_style(style_id: str, db: AsyncSession = Depends(get_db)):
 
 @router.post("/{style_id}/copy", status_code=status.HTTP_204_NO_CONTENT)
 async def increment_style_copy_count(style_id: str, db: AsyncSession = Depends(get_db)):
+    if copy_counter.enabled:
+        result = await db.execute(select(Style.id).where(Style.id == style_id))
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Style not found"
+            )
+        copy_counter.add_style(style_id)
+        return
+
     result = await db.execute(select(Style).where(Style.id == style_id))
     style = result.scalar_one_or_none()
     if not style:
@@ -288,3 +339,137 @@ async def toggle_style_favorite(style_id: str, db: AsyncSession = Depends(get_db
     db.add(folder_style)
 
     return {"is_favorited": True}
+
+
+async def _remote_media_url(db: AsyncSession, style_id: str, kind: str) -> str:
+    result = await db.execute(
+        select(Style.audio_source, Style.audio_metadata).where(Style.id == style_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Style not found"
+        )
+
+    audio_source, audio_metadata = row
+    try:
+        meta = json.loads(audio_metadata) if audio_metadata else {}
+    except ValueError:
+        meta = {}
+    if not isinstance(meta, dict):
+        meta = {}
+
+    url = meta.get(f"{kind}_url")
+    if kind == "preview" and not url:
+        url = audio_source
+    # Only iTunes preview/artwork hosts are proxied or fetched (no SSRF)
+    if not is_allowed_media_url(url):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"Style has no cacheable {kind}"
+        )
+    return url
+
+
+async def _serve_media(request: Request, db: AsyncSession, style_id: str, kind: str):
+    """Serve from the local media cache, else redirect to the origin and queue a fetch."""
+    url = await _remote_media_url(db, style_id, kind)
+    if settings.MEDIA_CACHE_ENABLED:
+        cached = await media_cache.get(db, url)
+        if cached is not None:
+            return serve_cached_file(request, *cached)
+    return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+
+
+@router.get("/{style_id}/preview")
+async def get_style_preview(
+    style_id: str, request: Request, db: AsyncSession = Depends(get_read_db)
+):
+    return await _serve_media(request, db, style_id, "preview")
+
+
+@router.get("/{style_id}/artwork")
+async def get_style_artwork(
+    style_id: str, request: Request, db: AsyncSession = Depends(get_read_db)
+):
+    return await _serve_media(request, db, style_id, "artwork")
+
+
+async def _local_audio_path(db: AsyncSession, style_id: str) -> Optional[Path]:
+    """The style's audio on local disk; None while a remote preview is being cached."""
+    result = await db.execute(
+        select(Style.audio_type, Style.audio_source).where(Style.id == style_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Style not found"
+        )
+
+    audio_type, audio_source = row
+    if audio_type == "local" and audio_source and audio_source.startswith("/storage/"):
+        storage = settings.STORAGE_PATH.resolve()
+        path = (storage / audio_source.removeprefix("/storage/")).resolve()
+        if path.is_relative_to(storage) and path.is_file():
+            return path
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Audio file not found"
+        )
+
+    if not settings.MEDIA_CACHE_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Waveforms need a local copy of the audio (media cache is disabled)",
+        )
+    url = await _remote_media_url(db, style_id, "preview")
+    cached = await media_cache.get(db, url)
+    return cached[0] if cached else None
+
+
+@router.get("/{style_id}/waveform", response_model=WaveformResponse)
+async def get_style_waveform(
+    style_id: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Precomputed peaks of the style's audio. Answers 202 (pending) while the
+    audio is being cached or decoded; poll again after Retry-After.
+    """
+    path = await _local_audio_path(db, style_id)
+    pending = WaveformResponse(style_id=style_id, status="pending")
+    if path is None:
+        response.status_code = status.HTTP_202_ACCEPTED
+        response.headers["Retry-After"] = "2"
+        return pending
+
+    key = await content_key(path)
+    etag = f'"{key[:32]}"'
+    waveform = await db.get(Waveform, key)
+    if waveform is not None:
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        return WaveformResponse(
+            style_id=style_id,
+            status="ready",
+            duration_ms=waveform.duration_ms,
+            peaks=list(array("b", waveform.peaks)),
+        )
+
+    failure = waveform_service.failure(key)
+    if failure:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Could not decode audio: {failure}",
+        )
+    if not waveform_service.can_decode(path):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Waveform extraction is unavailable (needs NumPy, and ffmpeg for compressed audio)",
+        )
+
+    waveform_service.schedule(key, path)
+    response.status_code = status.HTTP_202_ACCEPTED
+    response.headers["Retry-After"] = "1"
+    return pending
@@ -1,50 +1,102 @@
 # File: backend/app/routers/tags.py
 
-from datetime import datetime
-from typing import List
+from datetime import datetime, timedelta
+from typing import List, Literal, Optional
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy import select
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.models import TagStat
+from app.cache import hot_tags_cache
+from app.counters import (
+    copy_counter,
+    hot_tag_index,
+    hour_bucket,
+    normalize_tags,
+    record_tag_counts,
+    tag_counts_committed,
+)
+from app.database import get_db, get_read_db
+from app.models import TagStat, TagCopyBucket
 from app.schemas import TagStatResponse, TagCopyRequest
 
 router = APIRouter(prefix="/api/tags", tags=["tags"])
 
 
+WINDOWS = {"24h": timedelta(hours=24), "7d": timedelta(days=7), "30d": timedelta(days=30)}
+
+
 @router.get("/hot", response_model=List[TagStatResponse])
 async def get_hot_tags(
     limit: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    window: Optional[Literal["24h", "7d", "30d"]] = Query(
+        None, description="Only count copies within this window"
+    ),
+    decay: Optional[float] = Query(
+        None, gt=0, le=24 * 365, description="Half-life in hours for decayed scoring"
+    ),
+    db: AsyncSession = Depends(get_read_db),
 ):
+    if window is None and decay is None:
+        # All-time ranking is maintained incrementally as copy counts flush
+        return [TagStatResponse.model_validate(t) for t in await hot_tag_index.top(limit)]
+
+    # Cleared whenever tag copies are committed; the TTL only bounds how long
+    # the window edge can lag
+    cache_key = (window, decay, limit)
+    cached = hot_tags_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    items = await get_trending_tags(db, limit, WINDOWS[window or "30d"], decay)
+    hot_tags_cache.set(cache_key, items)
+    return items
+
+
+async def get_trending_tags(
+    db: AsyncSession, limit: int, window: timedelta, half_life_hours: Optional[float]
+) -> List[TagStatResponse]:
+    now = datetime.utcnow()
+    window_count = func.sum(TagCopyBucket.copy_count).label("window_count")
+    if half_life_hours:
+        age_hours = (func.julianday(now) - func.julianday(TagCopyBucket.bucket_start)) * 24
+        score = func.sum(
+            TagCopyBucket.copy_count * func.half_life_weight(age_hours, half_life_hours)
+        )
+    else:
+        score = window_count
+    score = score.label("score")
+
     query = (
-        select(TagStat)
-        .where(TagStat.copy_count > 0)
-        .order_by(TagStat.copy_count.desc())
+        select(TagCopyBucket.tag, window_count, score, TagStat.last_copied_at)
+        .join(TagStat, TagStat.tag == TagCopyBucket.tag)
+        .where(TagCopyBucket.bucket_start >= hour_bucket(now - window))
+        .group_by(TagCopyBucket.tag)
+        .order_by(score.desc())
         .limit(limit)
     )
     result = await db.execute(query)
-    return result.scalars().all()
+    return [
+        TagStatResponse(
+            tag=row.tag,
+            copy_count=row.window_count,
+            last_copied_at=row.last_copied_at,
+            score=row.score if half_life_hours else None,
+        )
+        for row in result.all()
+    ]
 
 
 @router.post("/copy", status_code=204)
 async def record_tag_copies(data: TagCopyRequest, db: AsyncSession = Depends(get_db)):
-    for tag in data.tags:
-        tag_lower = tag.lower().strip()
-        if not tag_lower:
-            continue
-
-        result = await db.execute(select(TagStat).where(TagStat.tag == tag_lower))
-        tag_stat = result.scalar_one_or_none()
-
-        if tag_stat:
-            tag_stat.copy_count += 1
-            tag_stat.last_copied_at = datetime.utcnow()
-        else:
-            tag_stat = TagStat(
-                tag=tag_lower,
-                copy_count=1,
-                last_copied_at=datetime.utcnow(),
-            )
-            db.add(tag_stat)
+    tags = normalize_tags(data.tags)
+    if not tags:
+        return
+
+    if copy_counter.enabled:
+        copy_counter.add_tags(tags)
+        return
+
+    now = datetime.utcnow()
+    await record_tag_counts(db, {tag: 1 for tag in tags}, {tag: now for tag in tags})
+    await db.commit()
+    await tag_counts_committed(tags)
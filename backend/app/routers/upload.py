@@ -0,0 +1,116 @@
+# File: backend/app/routers/upload.py
+"""
+Audio upload — users attach their own reference clips to styles.
+The raw request body is streamed to disk (never held in memory) and stored
+under a content hash, so the same clip uploaded twice is kept once.
+"""
+
+import json
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from app.config import settings
+from app.database import AsyncReadSessionLocal, AsyncSessionLocal
+from app.models import Style
+from app.routers.styles import build_style_response, get_favorited_style_ids
+from app.schemas import StyleResponse
+from app.uploads import AUDIO_EXTENSIONS, UploadTooLarge, audio_extension, store_audio
+
+router = APIRouter(prefix="/api/upload", tags=["upload"])
+
+
+class AudioUploadResponse(BaseModel):
+    audio_source: str
+    sha256: str
+    size: int
+    deduplicated: bool
+    style: Optional[StyleResponse] = None
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Audio files are limited to {settings.AUDIO_UPLOAD_MAX_BYTES} bytes",
+    )
+
+
+def _style_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND, detail="Style not found"
+    )
+
+
+@router.post(
+    "/audio", response_model=AudioUploadResponse, status_code=status.HTTP_201_CREATED
+)
+async def upload_audio(
+    request: Request,
+    filename: str = Query(..., max_length=255),
+    style_id: Optional[str] = Query(None),
+):
+    """
+    Store the raw request body as an audio file. With style_id the style is
+    switched to the uploaded clip (audio_type "local").
+    """
+    extension = audio_extension(filename)
+    if extension is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported audio type; expected one of {', '.join(sorted(AUDIO_EXTENSIONS))}",
+        )
+
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.AUDIO_UPLOAD_MAX_BYTES:
+        raise _too_large()
+
+    # Check the style on a read session that is closed before streaming, so
+    # a slow upload never holds the single write connection
+    if style_id is not None:
+        async with AsyncReadSessionLocal() as session:
+            exists = await session.scalar(select(Style.id).where(Style.id == style_id))
+        if exists is None:
+            raise _style_not_found()
+
+    try:
+        stored = await store_audio(request.stream(), extension, settings.AUDIO_UPLOAD_MAX_BYTES)
+    except UploadTooLarge:
+        raise _too_large()
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    response = AudioUploadResponse(
+        audio_source=stored.public_url,
+        sha256=stored.sha256,
+        size=stored.size,
+        deduplicated=stored.deduplicated,
+    )
+    if style_id is None:
+        return response
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Style).options(joinedload(Style.genre)).where(Style.id == style_id)
+        )
+        style = result.unique().scalar_one_or_none()
+        if not style:  # deleted while the file was uploading
+            raise _style_not_found()
+        style.audio_type = "local"
+        style.audio_platform = "local"
+        style.audio_source = stored.public_url
+        style.audio_metadata = json.dumps(
+            {
+                "platform": "local",
+                "file_name": filename,
+                "sha256": stored.sha256,
+                "size": stored.size,
+            },
+            ensure_ascii=False,
+        )
+        await db.commit()
+        await db.refresh(style)
+        favorited_ids = await get_favorited_style_ids(db, [style.id])
+        response.style = build_style_response(style, is_favorited=style.id in favorited_ids)
+    return response
@@ -11,12 +11,16 @@ from app.schemas.style import (
     StyleUpdate,
     StyleResponse,
     StyleListResponse,
+    WaveformResponse,
 )
 from app.schemas.folder import (
     FolderCreate,
     FolderUpdate,
     FolderResponse,
     FolderAddStyle,
+    FolderStylesBatch,
+    FolderStyleBatchResult,
+    FolderStylesBatchResponse,
 )
 from app.schemas.tag import TagStatResponse, TagCopyRequest
 
@@ -29,10 +33,14 @@ __all__ = [
     "StyleUpdate",
     "StyleResponse",
     "StyleListResponse",
+    "WaveformResponse",
     "FolderCreate",
     "FolderUpdate",
     "FolderResponse",
     "FolderAddStyle",
+    "FolderStylesBatch",
+    "FolderStyleBatchResult",
+    "FolderStylesBatchResponse",
     "TagStatResponse",
     "TagCopyRequest",
 ]
@@ -1,7 +1,7 @@
 # File: backend/app/schemas/folder.py
 
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Literal
 from pydantic import BaseModel, Field
 
 
@@ -29,3 +29,18 @@ class FolderResponse(FolderBase):
 
 class FolderAddStyle(BaseModel):
     style_id: str
+
+
+class FolderStylesBatch(BaseModel):
+    style_ids: List[str] = Field(..., min_length=1, max_length=1000)
+
+
+class FolderStyleBatchResult(BaseModel):
+    style_id: str
+    status: Literal["added", "already_in_folder", "removed", "not_in_folder", "not_found"]
+
+
+class FolderStylesBatchResponse(BaseModel):
+    folder_id: str
+    changed: int
+    results: List[FolderStyleBatchResult]
@@ -58,7 +58,15 @@ class StyleResponse(BaseModel):
 
 
 class StyleListResponse(BaseModel):
-    total: int
+    total: Optional[int] = None  # None when include_total=false
     page: int
     size: int
     items: List[StyleResponse]
+    next_cursor: Optional[str] = None  # set in cursor mode when more items follow
+
+
+class WaveformResponse(BaseModel):
+    style_id: str
+    status: Literal["ready", "pending"]
+    duration_ms: Optional[int] = None
+    peaks: List[int] = []  # 0-127 per bucket, empty while pending
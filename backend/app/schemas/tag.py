@@ -9,6 +9,7 @@ class TagStatResponse(BaseModel):
     tag: str
     copy_count: int
     last_copied_at: Optional[datetime] = None
+    score: Optional[float] = None  # decayed score when ?decay= is used
 
     class Config:
         from_attributes = True
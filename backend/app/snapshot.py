@@ -0,0 +1,177 @@
+# File: backend/app/snapshot.py
+"""
+AI-SUMMARY: Compact snapshot format for backups. A gzip-compressed,
+column-oriented rendering of the version 1.0 export document with tags and
+genre IDs interned into dictionaries. Converts losslessly to and from 1.0.
+"""
+
+import gzip
+import json
+import zlib
+from typing import Dict, List, Optional
+
+SNAPSHOT_FORMAT = "mpb-snapshot"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_MEDIA_TYPE = "application/gzip"
+DELTA_KEYS = ("since", "deleted")
+
+GENRE_COLUMNS = ("name", "level", "sort_order", "description", "era_prompt")
+STYLE_COLUMNS = (
+    "id",
+    "name",
+    "description",
+    "bpm_range",
+    "audio_type",
+    "audio_source",
+    "reference_url",
+    "copy_count",
+)
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+class SnapshotTooLarge(SnapshotError):
+    pass
+
+
+class _Interner:
+    """Maps values to dense indices in first-seen order."""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def __call__(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+
+def _columns(rows: List[dict], names) -> Dict[str, list]:
+    return {name: [row.get(name) for row in rows] for name in names}
+
+
+def encode_snapshot(document: dict) -> bytes:
+    """Encode a version 1.0 export document as a compressed snapshot."""
+    data = document["data"]
+    genres, styles, folders = data["genres"], data["styles"], data["folders"]
+
+    # Genre IDs come first so a genre's position is its interned index
+    genre_ids = _Interner()
+    for genre in genres:
+        genre_ids(genre["id"])
+    tags = _Interner()
+
+    snapshot = {
+        "format": SNAPSHOT_FORMAT,
+        "snapshot_version": SNAPSHOT_VERSION,
+        "version": document["version"],
+        "exported_at": document["exported_at"],
+        "genres": {
+            "count": len(genres),
+            "parent": [genre_ids(g.get("parent_id")) for g in genres],
+            **_columns(genres, GENRE_COLUMNS),
+        },
+        "styles": {
+            "count": len(styles),
+            "genre": [genre_ids(s.get("genre_id")) for s in styles],
+            "tags": [[tags(t) for t in s.get("tags", [])] for s in styles],
+            **_columns(styles, STYLE_COLUMNS),
+        },
+        "folders": {
+            "id": [f["id"] for f in folders],
+            "name": [f["name"] for f in folders],
+            "style_ids": [f.get("style_ids", []) for f in folders],
+        },
+        # Written last: styles may reference genres outside the export
+        "genre_ids": genre_ids.values,
+        "tag_dictionary": tags.values,
+    }
+    # Delta exports carry their watermark and tombstones through unchanged
+    for key in DELTA_KEYS:
+        if key in document:
+            snapshot[key] = document[key]
+    payload = json.dumps(snapshot, ensure_ascii=False, separators=(",", ":"))
+    return gzip.compress(payload.encode("utf-8"), compresslevel=6)
+
+
+def _gunzip(blob: bytes, max_bytes: int) -> bytes:
+    """Inflate at most max_bytes, so a tiny upload cannot expand into gigabytes."""
+    inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    payload = inflater.decompress(blob, max_bytes)
+    if inflater.unconsumed_tail:
+        raise SnapshotTooLarge(f"Snapshot expands beyond {max_bytes} bytes")
+    if not inflater.eof:
+        raise ValueError("compressed data is truncated")
+    return payload
+
+
+def decode_snapshot(blob: bytes, max_bytes: int) -> dict:
+    """Decode a snapshot back into the version 1.0 export document."""
+    try:
+        snapshot = json.loads(_gunzip(blob, max_bytes))
+    except SnapshotTooLarge:
+        raise
+    except (zlib.error, ValueError) as e:
+        raise SnapshotError(f"Not a valid snapshot: {e}") from e
+    if not isinstance(snapshot, dict) or snapshot.get("format") != SNAPSHOT_FORMAT:
+        raise SnapshotError("Not a valid snapshot: unknown format")
+    if snapshot.get("snapshot_version") != SNAPSHOT_VERSION:
+        raise SnapshotError(
+            f"Unsupported snapshot version: {snapshot.get('snapshot_version')}"
+        )
+
+    try:
+        genre_ids = snapshot["genre_ids"]
+        tag_dictionary = snapshot["tag_dictionary"]
+
+        def genre_id(index: int) -> Optional[str]:
+            return None if index < 0 else genre_ids[index]
+
+        g = snapshot["genres"]
+        genres = [
+            {
+                "id": genre_ids[i],
+                "name": g["name"][i],
+                "parent_id": genre_id(g["parent"][i]),
+                **{name: g[name][i] for name in GENRE_COLUMNS[1:]},
+            }
+            for i in range(g["count"])
+        ]
+
+        s = snapshot["styles"]
+        styles = []
+        for i in range(s["count"]):
+            styles.append(
+                {
+                    "id": s["id"][i],
+                    "name": s["name"][i],
+                    "tags": [tag_dictionary[t] for t in s["tags"][i]],
+                    "genre_id": genre_id(s["genre"][i]),
+                    **{name: s[name][i] for name in STYLE_COLUMNS[2:]},
+                }
+            )
+
+        f = snapshot["folders"]
+        folders = [
+            {"id": folder_id, "name": name, "style_ids": style_ids}
+            for folder_id, name, style_ids in zip(f["id"], f["name"], f["style_ids"])
+        ]
+    except (KeyError, IndexError, TypeError) as e:
+        raise SnapshotError(f"Corrupt snapshot: {e!r}") from e
+
+    document = {
+        "version": snapshot["version"],
+        "exported_at": snapshot["exported_at"],
+        "data": {"genres": genres, "styles": styles, "folders": folders},
+    }
+    for key in DELTA_KEYS:
+        if key in snapshot:
+            document[key] = snapshot[key]
+    return document
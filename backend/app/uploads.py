@@ -0,0 +1,77 @@
+# File: backend/app/uploads.py
+"""
+AI-SUMMARY: Stores uploaded audio clips under AUDIO_PATH/uploads. The request
+body is written to a temp file chunk by chunk while its SHA-256 is computed,
+then moved to a content-addressed name, so re-uploading the same clip reuses
+the existing file.
+"""
+
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+import aiofiles
+
+from app.config import settings
+
+AUDIO_EXTENSIONS = {".mp3", ".m4a", ".aac", ".wav", ".ogg", ".oga", ".flac", ".webm"}
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+@dataclass
+class StoredAudio:
+    path: Path
+    sha256: str
+    size: int
+    deduplicated: bool
+
+    @property
+    def public_url(self) -> str:
+        """URL under the /storage static mount."""
+        relative = self.path.resolve().relative_to(settings.STORAGE_PATH.resolve())
+        return f"/storage/{relative.as_posix()}"
+
+
+def audio_extension(filename: Optional[str]) -> Optional[str]:
+    suffix = Path(filename or "").suffix.lower()
+    return suffix if suffix in AUDIO_EXTENSIONS else None
+
+
+async def store_audio(chunks: AsyncIterator[bytes], extension: str, max_bytes: int) -> StoredAudio:
+    """
+    Stream chunks to disk, hashing as they arrive. Raises UploadTooLarge past
+    max_bytes and ValueError for an empty body.
+    """
+    uploads_dir = settings.AUDIO_PATH / "uploads"
+    uploads_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = uploads_dir / f".{uuid.uuid4().hex}.part"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(tmp_path, "wb") as f:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(f"Upload exceeds {max_bytes} bytes")
+                digest.update(chunk)
+                await f.write(chunk)
+
+        if size == 0:
+            raise ValueError("Empty upload")
+
+        sha256 = digest.hexdigest()
+        target = uploads_dir / sha256[:2] / f"{sha256}{extension}"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        deduplicated = target.exists()
+        if not deduplicated:
+            os.replace(tmp_path, target)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    return StoredAudio(path=target, sha256=sha256, size=size, deduplicated=deduplicated)
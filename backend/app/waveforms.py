@@ -0,0 +1,121 @@
+# File: backend/app/waveforms.py
+"""
+AI-SUMMARY: Computes waveform peaks for locally stored audio (uploads and the
+preview media cache) once per file content. Decoding runs in a process pool so
+it never blocks the event loop; results are stored in the waveforms table and
+shared by every style pointing at the same clip.
+"""
+
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.audio_peaks import NUMPY_AVAILABLE, can_decode, compute_peaks
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import Waveform
+
+logger = logging.getLogger(__name__)
+
+_SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+# path -> (mtime_ns, size, sha256) for files not named by their hash, so the
+# player polling a waveform does not re-hash the file on every request
+_hash_cache: Dict[str, Tuple[int, int, str]] = {}
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def content_key(path: Path) -> str:
+    """SHA-256 of the file; uploads and cached previews already carry it in their name."""
+    if _SHA256_RE.match(path.stem):
+        return path.stem
+    stat = path.stat()
+    cached = _hash_cache.get(str(path))
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    key = await asyncio.to_thread(_hash_file, path)
+    _hash_cache[str(path)] = (stat.st_mtime_ns, stat.st_size, key)
+    return key
+
+
+class WaveformService:
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._failed: Dict[str, str] = {}
+
+    @property
+    def available(self) -> bool:
+        return NUMPY_AVAILABLE
+
+    def can_decode(self, path: Path) -> bool:
+        return can_decode(path)
+
+    def failure(self, key: str) -> Optional[str]:
+        return self._failed.get(key)
+
+    async def stop(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def schedule(self, key: str, path: Path) -> None:
+        """Queue peak extraction for path unless it is running or already failed."""
+        if key in self._pending or key in self._failed:
+            return
+        self._pending.add(key)
+        task = asyncio.create_task(self.compute(key, path))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def compute(self, key: str, path: Path) -> Optional[Waveform]:
+        if self._executor is None:
+            # spawn: forking a process that runs an event loop and threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        loop = asyncio.get_running_loop()
+        try:
+            peaks, duration_ms = await loop.run_in_executor(
+                self._executor,
+                compute_peaks,
+                str(path),
+                settings.WAVEFORM_PEAK_COUNT,
+                settings.WAVEFORM_SAMPLE_RATE,
+                settings.WAVEFORM_DECODE_TIMEOUT_SECONDS,
+            )
+            async with AsyncSessionLocal() as session:
+                await session.execute(
+                    sqlite_insert(Waveform)
+                    .values(sha256=key, peaks=peaks, duration_ms=duration_ms)
+                    .on_conflict_do_nothing(index_elements=["sha256"])
+                )
+                await session.commit()
+        except Exception as e:
+            logger.warning("Waveform extraction failed for %s: %s", path, e)
+            self._failed[key] = str(e) or type(e).__name__
+            return None
+        finally:
+            self._pending.discard(key)
+        return Waveform(sha256=key, peaks=peaks, duration_ms=duration_ms)
+
+
+waveform_service = WaveformService(workers=settings.WAVEFORM_WORKERS)
@@ -10,8 +10,14 @@ import sys
 import uuid
 from pathlib import Path
 
+import httpx
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from app.http_client import shared_http_client
+from app.itunes_api import ITUNES_SEARCH_URL, fetch_itunes_json
+from itunes_matcher import DEFAULT_CONCURRENCY, bounded_map
+
 # ── Style data to insert ──
 NEW_STYLES = [
     # ═══ Funk (genre_1970s_funk) ═══
@@ -182,11 +188,10 @@ NEW_STYLES = [
 ]
 
 
-async def search_itunes(term: str, country: str = "US") -> dict | None:
+async def search_itunes(
+    client: httpx.AsyncClient, term: str, country: str = "US"
+) -> dict | None:
     """Search iTunes API for a track, return first result with preview."""
-    import httpx
-
-    url = "https://itunes.apple.com/search"
     params = {
         "term": term,
         "country": country,
@@ -195,15 +200,12 @@ async def search_itunes(term: str, country: str = "US") -> dict | None:
         "media": "music",
     }
 
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        try:
-            resp = await client.get(url, params=params)
-            resp.raise_for_status()
-        except Exception as e:
-            print(f"  [WARN] iTunes search failed for '{term}': {e}")
-            return None
+    try:
+        data = await fetch_itunes_json(client, ITUNES_SEARCH_URL, params)
+    except Exception as e:
+        print(f"  [WARN] iTunes search failed for '{term}': {e}")
+        return None
 
-    data = resp.json()
     for item in data.get("results", []):
         if item.get("wrapperType") == "track" and item.get("previewUrl"):
             artwork = item.get("artworkUrl100", "")
@@ -228,20 +230,24 @@ async def add_styles():
     inserted = 0
     no_audio = 0
 
+    # Search iTunes for every preview concurrently (rate limited), then insert
+    async with shared_http_client() as client:
+        search_terms = [s.get("itunes_search", s["name"]) for s in NEW_STYLES]
+        print(f"Searching iTunes for {len(search_terms)} styles ...")
+        itunes_results = await bounded_map(
+            lambda term: search_itunes(client, term), search_terms, DEFAULT_CONCURRENCY
+        )
+
     async with AsyncSessionLocal() as session:
-        for style_data in NEW_STYLES:
+        for style_data, search_term, itunes_result in zip(NEW_STYLES, search_terms, itunes_results):
             style_id = f"style_{uuid.uuid4().hex[:8]}"
 
-            # Search iTunes for preview
             audio_metadata = None
             audio_source = None
             audio_type = None
             audio_platform = None
 
-            search_term = style_data.get("itunes_search", style_data["name"])
-            print(f"Searching iTunes: {search_term} ...", end=" ")
-            itunes_result = await search_itunes(search_term)
-
+            print(f"{search_term}:", end=" ")
             if itunes_result:
                 audio_metadata = json.dumps(itunes_result, ensure_ascii=False)
                 audio_source = itunes_result["preview_url"]
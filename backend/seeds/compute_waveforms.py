@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Precompute waveform peaks for every locally stored clip: uploaded audio and
+previews in the media cache. Files are decoded in a process pool; clips that
+already have peaks are skipped, so the script is safe to re-run.
+Usage: python compute_waveforms.py
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.database import AsyncReadSessionLocal, engine
+from app.models import MediaCacheEntry, Waveform
+from app.uploads import AUDIO_EXTENSIONS
+from app.waveforms import content_key, waveform_service
+
+
+async def local_audio_files() -> list:
+    files = [
+        path
+        for path in (settings.AUDIO_PATH / "uploads").glob("*/*")
+        if path.suffix.lower() in AUDIO_EXTENSIONS
+    ]
+    async with AsyncReadSessionLocal() as session:
+        result = await session.execute(
+            select(MediaCacheEntry.path).where(MediaCacheEntry.content_type.like("audio/%"))
+        )
+        files.extend(settings.MEDIA_CACHE_PATH / relative for relative in result.scalars())
+    return [path for path in files if path.is_file()]
+
+
+async def compute_waveforms():
+    if not waveform_service.available:
+        print("NumPy is not installed; nothing to do")
+        return
+
+    async with AsyncReadSessionLocal() as session:
+        done = set((await session.execute(select(Waveform.sha256))).scalars())
+
+    todo = {}
+    for path in await local_audio_files():
+        key = await content_key(path)
+        if key not in done and waveform_service.can_decode(path):
+            todo.setdefault(key, path)
+    print(f"Computing waveforms for {len(todo)} clips ({len(done)} already done) ...")
+
+    started = time.monotonic()
+    # The pool bounds parallel decodes; gather just keeps every worker busy
+    results = await asyncio.gather(
+        *(waveform_service.compute(key, path) for key, path in todo.items())
+    )
+    await waveform_service.stop()
+    await engine.dispose()
+
+    computed = sum(1 for r in results if r is not None)
+    print(
+        f"Done: {computed} computed, {len(todo) - computed} failed "
+        f"in {time.monotonic() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(compute_waveforms())
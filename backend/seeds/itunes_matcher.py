@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the iTunes preview seed scripts.
+PreviewMatcher runs a match function for many styles concurrently (bounded by
+a semaphore; requests are paced by the shared iTunes rate limiter), writes
+matches to SQLite in batches, checkpoints finished style IDs so an interrupted
+run resumes where it stopped, and prints throughput as it goes. A style is
+finished once it matched or was definitively not found; one whose match raised
+(timeout, throttling) stays out of the checkpoint and is retried on resume.
+"""
+
+import argparse
+import asyncio
+import json
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, Tuple
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.http_client import shared_http_client
+
+DB_PATH = Path(__file__).parent.parent / "data" / "music_prompt_box.db"
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_BATCH_SIZE = 20
+
+# match(client, style_id, payload) -> iTunes track dict, or None if there is no
+# match; raises on request errors
+MatchFn = Callable[[httpx.AsyncClient, str, Any], Awaitable[Optional[dict]]]
+
+
+def track_metadata(track: dict) -> dict:
+    """The audio_metadata stored on a style for an iTunes track."""
+    artwork = track.get("artworkUrl100", "")
+    artwork600 = artwork.replace("100x100", "600x600") if artwork else None
+    return {
+        "platform": "itunes",
+        "track_id": track["trackId"],
+        "track_name": track["trackName"],
+        "artist_name": track["artistName"],
+        "artwork_url": artwork600,
+        "preview_url": track["previewUrl"],
+    }
+
+
+async def bounded_map(fn: Callable[[Any], Awaitable[Any]], items: Iterable, concurrency: int) -> list:
+    """Like asyncio.gather over fn(item), with at most `concurrency` running at once."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(item):
+        async with semaphore:
+            return await fn(item)
+
+    return await asyncio.gather(*(run(item) for item in items))
+
+
+class PreviewMatcher:
+    def __init__(
+        self,
+        db_path: Path,
+        checkpoint_path: Path,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        resume: bool = True,
+    ):
+        self.db_path = db_path
+        self.checkpoint_path = checkpoint_path
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.resume = resume
+        self.matched = 0
+        self.failed = 0
+        self.errored = 0
+        self._done: set = set()
+        self._pending: List[Tuple[str, Optional[dict]]] = []
+
+    def _load_checkpoint(self) -> None:
+        if self.resume and self.checkpoint_path.exists():
+            self._done = set(json.loads(self.checkpoint_path.read_text()))
+            print(f"Resuming: {len(self._done)} styles already done ({self.checkpoint_path.name})")
+
+    def _flush(self, conn: sqlite3.Connection) -> None:
+        if not self._pending:
+            return
+        conn.executemany(
+            """UPDATE styles SET
+               audio_type = 'url',
+               audio_source = ?,
+               audio_platform = 'itunes',
+               audio_metadata = ?,
+               updated_at = ?
+               WHERE id = ?""",
+            [
+                (
+                    track["previewUrl"],
+                    json.dumps(track_metadata(track), ensure_ascii=False),
+                    # Same text format as the ORM, so delta exports pick it up
+                    datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S.%f"),
+                    style_id,
+                )
+                for style_id, track in self._pending
+                if track
+            ],
+        )
+        conn.commit()
+        # Checkpoint only what is committed
+        self._done.update(style_id for style_id, _ in self._pending)
+        self.checkpoint_path.write_text(json.dumps(sorted(self._done)))
+        self._pending = []
+
+    async def run(self, jobs: List[Tuple[str, Any]], match: MatchFn) -> None:
+        """Match every (style_id, payload) job not yet in the checkpoint."""
+        self._load_checkpoint()
+        todo = [(style_id, payload) for style_id, payload in jobs if style_id not in self._done]
+        total = len(todo)
+        started = time.monotonic()
+        finished = 0
+
+        conn = sqlite3.connect(str(self.db_path))
+        try:
+            async with shared_http_client() as client:
+
+                async def run_one(job):
+                    nonlocal finished
+                    style_id, payload = job
+                    finished += 1
+                    try:
+                        track = await match(client, style_id, payload)
+                    except Exception as e:
+                        # Not checkpointed, so a resumed run tries it again
+                        print(f"  ERROR {style_id}: {e}")
+                        self.errored += 1
+                        return
+                    if track:
+                        self.matched += 1
+                    else:
+                        self.failed += 1
+                    self._pending.append((style_id, track))
+                    if len(self._pending) >= self.batch_size:
+                        self._flush(conn)
+                        rate = finished / (time.monotonic() - started)
+                        print(f"  [{finished}/{total}] {self.matched} matched, {self.failed} not found, "
+                              f"{self.errored} errors, {rate:.1f} styles/s")
+
+                await bounded_map(run_one, todo, self.concurrency)
+            self._flush(conn)
+        finally:
+            conn.close()
+
+        elapsed = time.monotonic() - started
+        rate = total / elapsed if elapsed > 0 else 0.0
+        print(f"\nDone: {self.matched} matched, {self.failed} not found, {self.errored} errors "
+              f"in {elapsed:.1f}s ({rate:.1f} styles/s)")
+        if self.errored:
+            print(f"Re-run to retry the {self.errored} styles that errored")
+        else:
+            # A complete run starts from scratch next time
+            self.checkpoint_path.unlink(missing_ok=True)
+
+
+def matcher_from_args(description: str, checkpoint_name: str) -> PreviewMatcher:
+    """Build a PreviewMatcher from the common command-line options."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="styles matched at once (requests are still rate limited)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="matches per database commit / checkpoint")
+    parser.add_argument("--fresh", action="store_true",
+                        help="ignore an existing checkpoint and start over")
+    args = parser.parse_args()
+    return PreviewMatcher(
+        db_path=DB_PATH,
+        checkpoint_path=DB_PATH.parent / f"{checkpoint_name}.checkpoint.json",
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        resume=not args.fresh,
+    )
@@ -5,12 +5,15 @@ Uses style name + genre name as search term to find accurate previews.
 """
 
 import asyncio
-import json
 import sqlite3
+import sys
 import httpx
 from pathlib import Path
 
-DB_PATH = Path(__file__).parent.parent / "data" / "music_prompt_box.db"
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.itunes_api import ITUNES_SEARCH_URL, fetch_itunes_json
+from itunes_matcher import DB_PATH, matcher_from_args
 
 # Search terms optimized for each style — hand-tuned for accuracy
 STYLE_SEARCH_MAP = {
@@ -38,7 +41,10 @@ STYLE_SEARCH_MAP = {
 
 
 async def search_itunes(client: httpx.AsyncClient, term: str, genre: str) -> dict | None:
-    """Search iTunes and return the best matching track."""
+    """
+    Search iTunes and return the best matching track, or None if there is
+    none. Request errors propagate so the style is retried on resume.
+    """
     search_term = f"{term} {genre}"
     params = {
         "term": search_term,
@@ -47,78 +53,40 @@ async def search_itunes(client: httpx.AsyncClient, term: str, genre: str) -> dic
         "limit": 5,
         "media": "music",
     }
-    try:
-        resp = await client.get("https://itunes.apple.com/search", params=params)
-        resp.raise_for_status()
-        data = resp.json()
-        results = [r for r in data.get("results", [])
-                   if r.get("wrapperType") == "track" and r.get("previewUrl")]
-        if results:
-            return results[0]
-    except Exception as e:
-        print(f"  ERROR: {e}")
-    return None
-
-
-async def main():
-    conn = sqlite3.connect(str(DB_PATH))
-    c = conn.cursor()
-
-    matched = 0
-    failed = 0
+    data = await fetch_itunes_json(client, ITUNES_SEARCH_URL, params)
+    results = [r for r in data.get("results", [])
+               if r.get("wrapperType") == "track" and r.get("previewUrl")]
+    return results[0] if results else None
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        for style_id, search_info in STYLE_SEARCH_MAP.items():
-            # Check if already has audio
-            row = c.execute(
-                "SELECT name, audio_source FROM styles WHERE id = ?",
-                (style_id,)
-            ).fetchone()
-            if not row:
-                print(f"  SKIP: {style_id} not found")
-                continue
-            style_name = row[0]
-            if row[1]:  # already has audio
-                print(f"  SKIP: {style_name} already has audio")
-                continue
 
-            print(f"  Searching: {style_name} -> '{search_info['term']}' ({search_info['genre']})")
+async def match_style(client: httpx.AsyncClient, style_id: str, search_info: dict) -> dict | None:
+    track = await search_itunes(client, search_info["term"], search_info["genre"])
+    if track:
+        print(f"  {style_id}: Matched {track['trackName']} - {track['artistName']} [{track.get('primaryGenreName', '?')}]")
+    else:
+        print(f"  {style_id}: NO MATCH ('{search_info['term']}')")
+    return track
 
-            track = await search_itunes(client, search_info["term"], search_info["genre"])
-            if track:
-                artwork = track.get("artworkUrl100", "")
-                artwork600 = artwork.replace("100x100", "600x600") if artwork else None
 
-                metadata = json.dumps({
-                    "platform": "itunes",
-                    "track_id": track["trackId"],
-                    "track_name": track["trackName"],
-                    "artist_name": track["artistName"],
-                    "artwork_url": artwork600,
-                    "preview_url": track["previewUrl"],
-                }, ensure_ascii=False)
-
-                c.execute(
-                    """UPDATE styles SET
-                       audio_type = 'url',
-                       audio_source = ?,
-                       audio_platform = 'itunes',
-                       audio_metadata = ?
-                       WHERE id = ?""",
-                    (track["previewUrl"], metadata, style_id)
-                )
-                conn.commit()
-                matched += 1
-                print(f"    -> Matched: {track['trackName']} - {track['artistName']} [{track.get('primaryGenreName', '?')}]")
-            else:
-                failed += 1
-                print(f"    -> NO MATCH")
-
-            # Small delay to be respectful to iTunes API
-            await asyncio.sleep(0.5)
+async def main():
+    matcher = matcher_from_args(__doc__, "match_itunes_previews")
 
+    conn = sqlite3.connect(str(DB_PATH))
+    jobs = []
+    for style_id, search_info in STYLE_SEARCH_MAP.items():
+        row = conn.execute(
+            "SELECT name, audio_source FROM styles WHERE id = ?",
+            (style_id,)
+        ).fetchone()
+        if not row:
+            print(f"  SKIP: {style_id} not found")
+        elif row[1]:  # already has audio
+            print(f"  SKIP: {row[0]} already has audio")
+        else:
+            jobs.append((style_id, search_info))
     conn.close()
-    print(f"\nDone: {matched} matched, {failed} failed")
+
+    await matcher.run(jobs, match_style)
 
 
 if __name__ == "__main__":
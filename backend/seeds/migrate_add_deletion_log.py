@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Migration: Add the deletion_log table and the change-tracking triggers used by
+delta exports (GET /api/data/export?since=). Deletions made before this runs
+are not logged, so take a full export once afterwards.
+Safe to run multiple times — skips the table if it already exists.
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.deletion_log import CHANGE_TRACKING_TRIGGERS
+
+DB_PATH = Path(__file__).parent.parent / "data" / "music_prompt_box.db"
+
+
+def table_exists(cursor: sqlite3.Cursor, table: str) -> bool:
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    )
+    return cursor.fetchone() is not None
+
+
+def migrate():
+    if not DB_PATH.exists():
+        print(f"Database not found at {DB_PATH}. Run seed_db.py first.")
+        sys.exit(1)
+
+    conn = sqlite3.connect(str(DB_PATH))
+    cursor = conn.cursor()
+
+    if not table_exists(cursor, "deletion_log"):
+        cursor.execute(
+            """CREATE TABLE deletion_log (
+                   id INTEGER NOT NULL PRIMARY KEY,
+                   table_name VARCHAR(50) NOT NULL,
+                   row_id VARCHAR(50) NOT NULL,
+                   deleted_at DATETIME NOT NULL
+               )"""
+        )
+        print("Created table: deletion_log")
+    else:
+        print("Table already exists: deletion_log (skipped)")
+
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS ix_deletion_log_deleted_at ON deletion_log (deleted_at)"
+    )
+    for statement in CHANGE_TRACKING_TRIGGERS:
+        cursor.execute(statement)
+
+    conn.commit()
+    conn.close()
+
+    print("Migration complete: change-tracking triggers installed.")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Migration: Add the normalized style_tags table (style_id, tag, position),
+its tag index and sync triggers, then backfill it from styles.tags_json.
+Safe to run multiple times — the table is rebuilt from tags_json each run.
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.style_tag import STYLE_TAG_TRIGGERS, BACKFILL_STYLE_TAGS
+
+DB_PATH = Path(__file__).parent.parent / "data" / "music_prompt_box.db"
+
+
+def table_exists(cursor: sqlite3.Cursor, table: str) -> bool:
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    )
+    return cursor.fetchone() is not None
+
+
+def migrate():
+    if not DB_PATH.exists():
+        print(f"Database not found at {DB_PATH}. Run seed_db.py first.")
+        sys.exit(1)
+
+    conn = sqlite3.connect(str(DB_PATH))
+    cursor = conn.cursor()
+
+    if not table_exists(cursor, "style_tags"):
+        cursor.execute(
+            """CREATE TABLE style_tags (
+                   style_id VARCHAR(50) NOT NULL,
+                   position INTEGER NOT NULL,
+                   tag VARCHAR(100) NOT NULL,
+                   PRIMARY KEY (style_id, position),
+                   FOREIGN KEY(style_id) REFERENCES styles (id) ON DELETE CASCADE
+               )"""
+        )
+        print("Created table: style_tags")
+    else:
+        print("Table already exists: style_tags (skipped)")
+
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS ix_style_tags_tag_style_id ON style_tags (tag, style_id)"
+    )
+    for statement in STYLE_TAG_TRIGGERS + BACKFILL_STYLE_TAGS:
+        cursor.execute(statement)
+
+    cursor.execute("SELECT count(*), count(DISTINCT style_id) FROM style_tags")
+    tag_rows, styles_tagged = cursor.fetchone()
+
+    conn.commit()
+    conn.close()
+
+    print(f"Migration complete: {tag_rows} tag rows backfilled for {styles_tagged} styles.")
+
+
+if __name__ == "__main__":
+    migrate()
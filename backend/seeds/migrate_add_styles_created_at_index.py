@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Migration: Add the (created_at, id) index on styles used by keyset pagination.
+Safe to run multiple times — skips if the index already exists.
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+DB_PATH = Path(__file__).parent.parent / "data" / "music_prompt_box.db"
+
+INDEX_NAME = "ix_styles_created_at_id"
+
+
+def index_exists(cursor: sqlite3.Cursor, index: str) -> bool:
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (index,)
+    )
+    return cursor.fetchone() is not None
+
+
+def migrate():
+    if not DB_PATH.exists():
+        print(f"Database not found at {DB_PATH}. Run seed_db.py first.")
+        sys.exit(1)
+
+    conn = sqlite3.connect(str(DB_PATH))
+    cursor = conn.cursor()
+
+    if not index_exists(cursor, INDEX_NAME):
+        cursor.execute(f"CREATE INDEX {INDEX_NAME} ON styles (created_at, id)")
+        print(f"Added index: {INDEX_NAME}")
+    else:
+        print(f"Index already exists: {INDEX_NAME} (skipped)")
+
+    conn.commit()
+    conn.close()
+
+
+if __name__ == "__main__":
+    migrate()
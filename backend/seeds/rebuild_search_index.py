@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Rebuild the styles_fts full-text index from the styles table.
+Creates the FTS table and its sync triggers if missing. Safe to run any time,
+e.g. after bulk edits made with sync triggers disabled or after restoring a DB file.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import engine
+from app.models.style_fts import create_style_fts, rebuild_style_fts
+
+
+async def rebuild_search_index():
+    async with engine.begin() as conn:
+        await conn.run_sync(create_style_fts)
+        indexed = await conn.run_sync(rebuild_style_fts)
+
+    await engine.dispose()
+    print(f"Rebuilt search index: {indexed} styles indexed")
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_search_index())
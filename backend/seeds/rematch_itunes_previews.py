@@ -2,16 +2,22 @@
 """
 Rematch iTunes preview audio with strict genre validation.
 Each style gets a hand-picked search targeting the definitive artist/track.
-Results are rejected if iTunes genre label doesn't match expectations.
+All searches for a style run in parallel; the pooled candidates are ranked by
+genre acceptance, word overlap with the searches and release decade, and a
+track outside the accepted genres is only used when no candidate is in them.
 """
 
 import asyncio
-import json
 import sqlite3
+import sys
 import httpx
 from pathlib import Path
 
-DB_PATH = Path(__file__).parent.parent / "data" / "music_prompt_box.db"
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.itunes_api import ITUNES_SEARCH_URL, fetch_itunes_json
+from app.itunes_ranking import genre_decade, rank_candidates
+from itunes_matcher import DB_PATH, matcher_from_args
 
 # Hand-curated search map: style_id -> {search terms, expected iTunes genre, fallback}
 # iTunes genre labels are limited: Pop, Rock, Dance, R&B/Soul, Hip-Hop/Rap, Electronic, 
@@ -209,15 +215,9 @@ async def search_itunes(client: httpx.AsyncClient, term: str, genre_hint: str) -
         "limit": 10,
         "media": "music",
     }
-    try:
-        resp = await client.get("https://itunes.apple.com/search", params=params)
-        resp.raise_for_status()
-        data = resp.json()
-        return [r for r in data.get("results", [])
-                if r.get("wrapperType") == "track" and r.get("previewUrl")]
-    except Exception as e:
-        print(f"    SEARCH ERROR: {e}")
-        return []
+    data = await fetch_itunes_json(client, ITUNES_SEARCH_URL, params)
+    return [r for r in data.get("results", [])
+            if r.get("wrapperType") == "track" and r.get("previewUrl")]
 
 
 def validate_track(track: dict, accept_genres: list) -> bool:
@@ -226,95 +226,72 @@ def validate_track(track: dict, accept_genres: list) -> bool:
     return track_genre in accept_genres
 
 
-def pick_best_track(tracks: list, accept_genres: list, search_term: str) -> dict | None:
-    """Pick the best track: prefer genre match, then closest name match."""
-    genre_matched = [t for t in tracks if validate_track(t, accept_genres)]
-    pool = genre_matched if genre_matched else tracks
+def pick_best_track(
+    result_lists: list, accept_genres: list, search_terms: list, decade: int | None
+) -> dict | None:
+    """
+    Pool every search's results and take the highest-scoring track whose
+    genre is accepted; only when none is, fall back to the best overall.
+    """
+    ranked = rank_candidates(result_lists, search_terms, accept_genres, decade)
+    for scored in ranked:
+        if validate_track(scored.track, accept_genres):
+            return scored.track
+    return ranked[0].track if ranked else None
 
-    if not pool:
-        return None
 
-    # Among matched, prefer tracks where artist appears in search term
-    search_lower = search_term.lower()
-    for t in pool:
-        if t.get("artistName", "").lower() in search_lower:
-            return t
+async def match_style(client: httpx.AsyncClient, style_id: str, info: dict) -> dict | None:
+    # All searches go out at once; candidates are pooled and ranked together
+    searches = info["searches"]
+    outcomes = await asyncio.gather(
+        *(search_itunes(client, cfg["term"], cfg["genre"]) for cfg in searches),
+        return_exceptions=True,
+    )
+    errors = [o for o in outcomes if isinstance(o, Exception)]
+    results = [o for o in outcomes if not isinstance(o, Exception)]
+    search_terms = [cfg["term"] for cfg in searches]
+    best_track = pick_best_track(results, info["accept_genres"], search_terms, info["decade"])
+    if best_track is None and errors:
+        # Not a definitive miss: let the matcher retry this style on resume
+        raise errors[0]
 
-    # Fallback: first genre-matched track
-    return pool[0]
+    lines = [f"\n{style_id}: {info['name']}"]
+    for search_cfg, outcome in zip(searches, outcomes):
+        if isinstance(outcome, Exception):
+            lines.append(f"  Tried: '{search_cfg['term']}' [{search_cfg['genre']}] -> SEARCH ERROR: {outcome}")
+        else:
+            lines.append(f"  Tried: '{search_cfg['term']}' [{search_cfg['genre']}] -> {len(outcome)} results")
+    if best_track:
+        genre_ok = validate_track(best_track, info["accept_genres"])
+        status = "GENRE OK" if genre_ok else "GENRE WARN"
+        lines.append(f"  >> FINAL: {best_track['trackName']} - {best_track['artistName']} [{best_track.get('primaryGenreName', '?')}] {status}")
+    else:
+        lines.append(f"  >> FAILED: No suitable match found")
+    # One print per style so concurrent output does not interleave
+    print("\n".join(lines))
+    return best_track
 
 
 async def main():
-    conn = sqlite3.connect(str(DB_PATH))
-    c = conn.cursor()
-
-    matched = 0
-    failed = 0
-
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        for style_id, info in STYLE_MATCHES.items():
-            row = c.execute("SELECT name FROM styles WHERE id = ?", (style_id,)).fetchone()
-            if not row:
-                continue
-
-            style_name = info["name"]
-            print(f"\n{style_id}: {style_name}")
-
-            best_track = None
-            for search_cfg in info["searches"]:
-                print(f"  Trying: '{search_cfg['term']}' [{search_cfg['genre']}]")
-                tracks = await search_itunes(client, search_cfg["term"], search_cfg["genre"])
-                
-                track = pick_best_track(tracks, info["accept_genres"], search_cfg["term"])
-                if track:
-                    is_genre_match = validate_track(track, info["accept_genres"])
-                    print(f"    -> {track['trackName']} - {track['artistName']} [{track.get('primaryGenreName', '?')}] {'OK' if is_genre_match else 'GENRE MISMATCH'}")
-                    if is_genre_match:
-                        best_track = track
-                        break
-                    elif not best_track:
-                        best_track = track  # keep as fallback, try next
-                else:
-                    print(f"    -> No results")
-
-                await asyncio.sleep(0.3)
-
-            if best_track:
-                artwork = best_track.get("artworkUrl100", "")
-                artwork600 = artwork.replace("100x100", "600x600") if artwork else None
-
-                metadata = json.dumps({
-                    "platform": "itunes",
-                    "track_id": best_track["trackId"],
-                    "track_name": best_track["trackName"],
-                    "artist_name": best_track["artistName"],
-                    "artwork_url": artwork600,
-                    "preview_url": best_track["previewUrl"],
-                }, ensure_ascii=False)
-
-                c.execute(
-                    """UPDATE styles SET
-                       audio_type = 'url',
-                       audio_source = ?,
-                       audio_platform = 'itunes',
-                       audio_metadata = ?
-                       WHERE id = ?""",
-                    (best_track["previewUrl"], metadata, style_id)
-                )
-                conn.commit()
-                matched += 1
-                genre_ok = validate_track(best_track, info["accept_genres"])
-                status = "GENRE OK" if genre_ok else "GENRE WARN"
-                print(f"  >> FINAL: {best_track['trackName']} - {best_track['artistName']} [{best_track.get('primaryGenreName', '?')}] {status}")
-            else:
-                failed += 1
-                print(f"  >> FAILED: No suitable match found")
-
-            await asyncio.sleep(0.5)
+    matcher = matcher_from_args(__doc__, "rematch_itunes_previews")
 
+    conn = sqlite3.connect(str(DB_PATH))
+    # Decade of each style's genre (e.g. genre_1970s_funk), used in scoring
+    decades = {
+        style_id: genre_decade(filter(None, (genre_id, parent_id)))
+        for style_id, genre_id, parent_id in conn.execute(
+            """SELECT styles.id, styles.genre_id, genres.parent_id
+               FROM styles LEFT JOIN genres ON genres.id = styles.genre_id"""
+        )
+    }
     conn.close()
-    print(f"\n{'='*60}")
-    print(f"Done: {matched} matched, {failed} failed")
+    jobs = [
+        (style_id, {**info, "decade": decades[style_id]})
+        for style_id, info in STYLE_MATCHES.items()
+        if style_id in decades
+    ]
+
+    await matcher.run(jobs, match_style)
 
 
 if __name__ == "__main__":
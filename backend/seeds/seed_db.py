@@ -9,6 +9,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.database import engine, AsyncSessionLocal, Base
 from app.models import Genre, Style, Folder, FolderStyle
+from app.models.genre_closure import rebuild_genre_closure
 
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
@@ -48,6 +49,9 @@ async def seed_database():
             )
             await session.execute(stmt)
 
+        conn = await session.connection()
+        await conn.run_sync(rebuild_genre_closure)
+
         await session.commit()
         print(f"Upserted {len(data['data']['genres'])} genres")
 
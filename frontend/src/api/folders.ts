@@ -1,5 +1,5 @@
 import apiClient from './client'
-import type { Folder, FolderCreateInput } from '@/types'
+import type { Folder, FolderCreateInput, FolderStylesBatchResponse } from '@/types'
 
 export async function fetchFolders(): Promise<Folder[]> {
   const response = await apiClient.get<Folder[]>('/folders')
@@ -27,3 +27,13 @@ export async function addStyleToFolder(folderId: string, styleId: string): Promi
 export async function removeStyleFromFolder(folderId: string, styleId: string): Promise<void> {
   await apiClient.delete(`/folders/${folderId}/styles/${styleId}`)
 }
+
+export async function addStylesToFolder(folderId: string, styleIds: string[]): Promise<FolderStylesBatchResponse> {
+  const response = await apiClient.post<FolderStylesBatchResponse>(`/folders/${folderId}/styles:batch`, { style_ids: styleIds })
+  return response.data
+}
+
+export async function removeStylesFromFolder(folderId: string, styleIds: string[]): Promise<FolderStylesBatchResponse> {
+  const response = await apiClient.delete<FolderStylesBatchResponse>(`/folders/${folderId}/styles:batch`, { data: { style_ids: styleIds } })
+  return response.data
+}
@@ -1,5 +1,5 @@
 import apiClient from './client'
-import type { Style, StyleListResponse, StyleCreateInput, StyleUpdateInput } from '@/types'
+import type { Style, StyleListResponse, StyleCreateInput, StyleUpdateInput, WaveformResponse } from '@/types'
 
 interface FetchStylesParams {
   genre_id?: string
@@ -7,6 +7,8 @@ interface FetchStylesParams {
   folder_id?: string
   page?: number
   size?: number
+  cursor?: string
+  include_total?: boolean
 }
 
 export async function fetchStyles(params: FetchStylesParams = {}): Promise<StyleListResponse> {
@@ -41,3 +43,9 @@ export async function toggleStyleFavorite(id: string): Promise<boolean> {
   const response = await apiClient.post<{ is_favorited: boolean }>(`/styles/${id}/toggle-favorite`)
   return response.data.is_favorited
 }
+
+// Peaks are computed server-side; status 'pending' means try again shortly
+export async function fetchStyleWaveform(id: string): Promise<WaveformResponse> {
+  const response = await apiClient.get<WaveformResponse>(`/styles/${id}/waveform`)
+  return response.data
+}
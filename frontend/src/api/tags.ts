@@ -1,8 +1,13 @@
 import apiClient from './client'
 import type { TagStat } from '@/types'
 
-export async function fetchHotTags(limit: number = 20): Promise<TagStat[]> {
-  const response = await apiClient.get<TagStat[]>('/tags/hot', { params: { limit } })
+interface HotTagsOptions {
+  window?: '24h' | '7d' | '30d'
+  decay?: number  // half-life in hours
+}
+
+export async function fetchHotTags(limit: number = 20, options: HotTagsOptions = {}): Promise<TagStat[]> {
+  const response = await apiClient.get<TagStat[]>('/tags/hot', { params: { limit, ...options } })
   return response.data
 }
 
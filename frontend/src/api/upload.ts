@@ -0,0 +1,15 @@
+import apiClient from './client'
+import type { AudioUploadResponse } from '@/types'
+
+// The file is sent as the raw request body so the backend can stream it to disk
+export async function uploadAudio(file: File, styleId?: string): Promise<AudioUploadResponse> {
+  const params: Record<string, string> = { filename: file.name }
+  if (styleId) {
+    params.style_id = styleId
+  }
+  const response = await apiClient.post<AudioUploadResponse>('/upload/audio', file, {
+    params,
+    headers: { 'Content-Type': file.type || 'application/octet-stream' },
+  })
+  return response.data
+}
@@ -41,15 +41,22 @@ globalAudio.addEventListener('durationchange', () => {
  * Resolve the actual playable audio URL from a Style object.
  * - For 'itunes' platform: extract preview_url from audio_metadata JSON
  * - For 'url' or 'local': use audio_source directly
+ * iTunes previews go through the backend media cache, which serves a local
+ * copy with range support or redirects to the origin. Other URLs are played
+ * directly (the backend only fetches from Apple's preview hosts).
  */
 function resolveAudioUrl(style: Style): string | null {
+  let url = style.audio_source || null
   if (style.audio_platform === 'itunes' && style.audio_metadata) {
     try {
       const meta = JSON.parse(style.audio_metadata)
-      if (meta.preview_url) return meta.preview_url
+      if (meta.preview_url) url = meta.preview_url
     } catch { /* fall through */ }
   }
-  return style.audio_source || null
+  if (style.audio_platform === 'itunes' && url && /^https?:\/\//i.test(url)) {
+    return `/api/styles/${style.id}/preview`
+  }
+  return url
 }
 
 export function useAudio() {
@@ -5,7 +5,7 @@ import { fetchStyles, createStyle, updateStyle, deleteStyle, incrementStyleCopyC
 
 export const useStylesStore = defineStore('styles', () => {
   const styles = ref<Style[]>([])
-  const total = ref(0)
+  const total = ref<number | null>(0)
   const page = ref(1)
   const size = ref(20)
   const loading = ref(false)
@@ -15,6 +15,16 @@ export const useStylesStore = defineStore('styles', () => {
   const filterGenreId = ref<string | null>(null)
   const filterFolderId = ref<string | null>(null)
 
+  // Without a total (include_total=false) a full page means there may be more
+  const totalPages = computed(() =>
+    total.value === null ? null : Math.ceil(total.value / size.value)
+  )
+  const hasNextPage = computed(() =>
+    totalPages.value === null
+      ? styles.value.length === size.value
+      : page.value < totalPages.value
+  )
+
   async function loadStyles() {
     loading.value = true
     error.value = null
@@ -117,6 +127,8 @@ export const useStylesStore = defineStore('styles', () => {
   return {
     styles,
     total,
+    totalPages,
+    hasNextPage,
     page,
     size,
     loading,
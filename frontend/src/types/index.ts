@@ -31,10 +31,11 @@ export interface Style {
 }
 
 export interface StyleListResponse {
-  total: number
+  total: number | null  // null when requested with include_total=false
   page: number
   size: number
   items: Style[]
+  next_cursor?: string | null
 }
 
 export interface Folder {
@@ -49,6 +50,7 @@ export interface TagStat {
   tag: string
   copy_count: number
   last_copied_at: string | null
+  score?: number | null
 }
 
 export interface StyleCreateInput {
@@ -81,6 +83,15 @@ export interface FolderCreateInput {
   name: string
 }
 
+export interface FolderStylesBatchResponse {
+  folder_id: string
+  changed: number
+  results: Array<{
+    style_id: string
+    status: 'added' | 'already_in_folder' | 'removed' | 'not_in_folder' | 'not_found'
+  }>
+}
+
 export interface ExportData {
   version: string
   exported_at: string
@@ -122,3 +133,18 @@ export interface ITuneAudioMetadata {
   artwork_url: string | null
   preview_url: string | null
 }
+
+export interface AudioUploadResponse {
+  audio_source: string
+  sha256: string
+  size: number
+  deduplicated: boolean
+  style: Style | null
+}
+
+export interface WaveformResponse {
+  style_id: string
+  status: 'ready' | 'pending'
+  duration_ms: number | null
+  peaks: number[]  // 0-127 per bucket
+}